@@ -42,6 +42,8 @@ cloudinary.config(
     api_key=config("API_KEY"),
     api_secret=config("API_SECRET"),
     secure=True,
+    # API base URL; point at a local fake server in development
+    upload_prefix=config("CLOUDINARY_UPLOAD_PREFIX", default="") or None,
 )
 
 # ─── Installed Apps ──────────────────────────────────────────────
@@ -76,6 +78,7 @@ MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "utils.middleware.CoalesceInvalidationsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -215,6 +218,25 @@ else:
         }
     }
 
+# Per-process LRU in front of the shared cache (utils.cache). Only worth it
+# when the shared cache is remote, so it is off by default with LocMem.
+CACHE_LOCAL_MAX_ENTRIES = config(
+    "CACHE_LOCAL_MAX_ENTRIES",
+    default=512 if CACHES["default"]["BACKEND"] == "django_redis.cache.RedisCache" else 0,
+    cast=int,
+)
+CACHE_LOCAL_TIMEOUT = config("CACHE_LOCAL_TIMEOUT", default=30, cast=int)  # seconds
+
+# cached_view payload codec (utils.cache_codecs) and zlib threshold
+CACHE_CODEC = config("CACHE_CODEC", default="json")
+CACHE_COMPRESS_MIN_BYTES = config("CACHE_COMPRESS_MIN_BYTES", default=1024, cast=int)
+
+# cached_view hit/miss counters are flushed to the shared cache this often
+CACHE_METRICS_FLUSH_INTERVAL = config("CACHE_METRICS_FLUSH_INTERVAL", default=30, cast=int)  # seconds
+
+# Warm every cached endpoint after `migrate` (the Render release step)
+CACHE_WARM_ON_MIGRATE = config("CACHE_WARM_ON_MIGRATE", default=False, cast=bool)
+
 # ─── Cloudinary Storage ─────────────────────────────────────────
 DEFAULT_FILE_STORAGE = "cloudinary_storage.storage.MediaCloudinaryStorage"
 CLOUDINARY_STORAGE = {
@@ -223,6 +245,26 @@ CLOUDINARY_STORAGE = {
     "API_SECRET": config("API_SECRET"),
 }
 
+# ─── Background Uploads (uploads.jobs) ──────────────────────────
+# True: upload endpoints answer 202 + job id and upload in a thread pool
+# (?async=0/1 overrides per request)
+UPLOAD_ASYNC = config("UPLOAD_ASYNC", default=False, cast=bool)
+UPLOAD_WORKERS = config("UPLOAD_WORKERS", default=2, cast=int)  # threads per process
+
+# Local pre-processing before upload (utils.cloudinary_service, needs Pillow)
+IMAGE_PREPROCESS = config("IMAGE_PREPROCESS", default=False, cast=bool)
+IMAGE_MAX_DIMENSION = config("IMAGE_MAX_DIMENSION", default=2048, cast=int)  # px, longest side
+IMAGE_WEBP_QUALITY = config("IMAGE_WEBP_QUALITY", default=82, cast=int)
+IMAGE_PREPROCESS_WORKERS = config("IMAGE_PREPROCESS_WORKERS", default=2, cast=int)
+
+# Cloudinary HTTP client (utils.cloudinary_service): keep-alive pool,
+# timeouts, retries, and concurrency of batch uploads
+CLOUDINARY_POOL_SIZE = config("CLOUDINARY_POOL_SIZE", default=10, cast=int)
+CLOUDINARY_CONNECT_TIMEOUT = config("CLOUDINARY_CONNECT_TIMEOUT", default=5, cast=float)  # seconds
+CLOUDINARY_READ_TIMEOUT = config("CLOUDINARY_READ_TIMEOUT", default=60, cast=float)  # seconds
+CLOUDINARY_RETRIES = config("CLOUDINARY_RETRIES", default=3, cast=int)
+CLOUDINARY_BATCH_WORKERS = config("CLOUDINARY_BATCH_WORKERS", default=4, cast=int)
+
 # ─── Static Files (admin panel CSS only) ─────────────────────────
 STATIC_URL = "/static/"
 STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
@@ -1,9 +1,11 @@
 from rest_framework import serializers
+
+from utils.fieldsets import SparseFieldsetMixin
 from .models import Post, PostLike
 from users.serializers import UserSerializer
 
 
-class PostPublicSerializer(serializers.ModelSerializer):
+class PostPublicSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     author = UserSerializer(read_only=True)
     like_count = serializers.SerializerMethodField()
     is_liked = serializers.SerializerMethodField()
@@ -14,6 +16,7 @@ class PostPublicSerializer(serializers.ModelSerializer):
             "id", "author", "title", "description", "image_url",
             "created_at", "updated_at", "like_count", "is_liked",
         ]
+        field_columns = {"like_count": (), "is_liked": ()}
 
     def get_like_count(self, obj):
         return obj.likes.count()
@@ -25,7 +28,7 @@ class PostPublicSerializer(serializers.ModelSerializer):
         return False
 
 
-class PostAdminSerializer(serializers.ModelSerializer):
+class PostAdminSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     author_email = serializers.CharField(source="author.email", read_only=True)
     like_count = serializers.SerializerMethodField()
 
@@ -36,6 +39,7 @@ class PostAdminSerializer(serializers.ModelSerializer):
             "image_url", "image_public_id", "is_published",
             "created_at", "updated_at", "like_count",
         ]
+        field_columns = {"like_count": ()}
         read_only_fields = ["id", "created_at", "updated_at"]
 
     def get_like_count(self, obj):
@@ -1,11 +1,17 @@
+from django.db import transaction
 from rest_framework import generics, status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from utils.cache import cached_view, cache_key, invalidate, CACHE_TTL
+from utils.cache import cached_view, query_key, invalidate_tags, CACHE_TTL
+from utils.conditional import ConditionalGetMixin, AdminConditionalGetMixin
+from utils.fieldsets import SparseFieldsetViewMixin
+from utils.pagination import OptionalPageNumberPagination
 from utils.permissions import IsAdminUser
-from utils.cloudinary_service import upload_image, delete_image
+from uploads.assets import release_image, store_image
+from uploads.jobs import enqueue_upload, wants_async
+from uploads.views import accepted
 from .models import Post, PostLike
 from .serializers import PostPublicSerializer, PostAdminSerializer
 
@@ -13,27 +19,59 @@ from .serializers import PostPublicSerializer, PostAdminSerializer
 # ═══════════════════ PUBLIC VIEWS ═══════════════════
 
 
-class PostListView(generics.ListAPIView):
+def overlay_is_liked(request, data):
+    """Fill in is_liked for the viewer on the shared (cached) post list."""
+    posts = data["results"] if isinstance(data, dict) else data
+    # Skipped when ?fields= / ?omit= trimmed is_liked (or the id) away
+    posts = [post for post in posts if "is_liked" in post and "id" in post]
+    if not posts:
+        return data
+    liked = set(
+        PostLike.objects.filter(
+            user=request.user, post_id__in=[post["id"] for post in posts]
+        ).values_list("post_id", flat=True)
+    )
+    for post in posts:
+        post["is_liked"] = post["id"] in liked
+    return data
+
+
+class PostListView(SparseFieldsetViewMixin, ConditionalGetMixin, generics.ListAPIView):
     serializer_class = PostPublicSerializer
     permission_classes = [AllowAny]
+    watermark_tags = ["posts"]
+    watermark_per_viewer = True
+    pagination_class = OptionalPageNumberPagination
+    ordering_fields = ["created_at"]
 
     def get_queryset(self):
         return Post.objects.filter(is_published=True).select_related("author")
 
+    def get_serializer_context(self):
+        # No request: the cached body is viewer-independent (is_liked=False);
+        # overlay_is_liked adds the per-user part on top.
+        context = super().get_serializer_context()
+        context.pop("request", None)
+        return context
+
     @cached_view(
-        key_func=lambda self, req: cache_key("post_list"),
+        key_func=query_key("post_list"),
         timeout=CACHE_TTL["medium"],
+        tags=["posts"],
+        stale_ttl=CACHE_TTL["medium"],
+        prerender=True,
+        overlay=overlay_is_liked,
     )
     def get(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True, context={"request": request})
-        return Response(serializer.data)
+        return self.list(request, *args, **kwargs)
 
 
-class PostDetailView(generics.RetrieveAPIView):
+class PostDetailView(SparseFieldsetViewMixin, ConditionalGetMixin, generics.RetrieveAPIView):
     queryset = Post.objects.select_related("author")
     serializer_class = PostPublicSerializer
     permission_classes = [AllowAny]
+    watermark_tags = ["posts"]
+    watermark_per_viewer = True
 
 
 class PostLikeView(APIView):
@@ -52,7 +90,7 @@ class PostLikeView(APIView):
         else:
             message = "Like added"
 
-        invalidate(cache_key("post_list"))
+        invalidate_tags("posts")
         post.refresh_from_db()
         serializer = PostPublicSerializer(post, context={"request": request})
         return Response({"message": message, "post": serializer.data})
@@ -61,33 +99,36 @@ class PostLikeView(APIView):
 # ═══════════════════ ADMIN VIEWS ═══════════════════
 
 
-class AdminPostListCreateView(generics.ListCreateAPIView):
+class AdminPostListCreateView(SparseFieldsetViewMixin, AdminConditionalGetMixin, generics.ListCreateAPIView):
     """
     GET  /api/admin/posts/  — list all posts for admin
     POST /api/admin/posts/  — create new post
     """
     permission_classes = [IsAdminUser]
+    watermark_tags = ["posts"]
     serializer_class = PostAdminSerializer
     queryset = Post.objects.select_related("author").all()
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
-        invalidate(cache_key("post_list"))
+        invalidate_tags("posts")
 
 
-class AdminPostDetailView(generics.RetrieveUpdateDestroyAPIView):
+class AdminPostDetailView(SparseFieldsetViewMixin, AdminConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAdminUser]
+    watermark_tags = ["posts"]
     serializer_class = PostAdminSerializer
     queryset = Post.objects.all()
 
     def perform_update(self, serializer):
         serializer.save()
-        invalidate(cache_key("post_list"))
+        invalidate_tags("posts")
 
     def perform_destroy(self, instance):
-        delete_image(instance.image_public_id)
-        instance.delete()
-        invalidate(cache_key("post_list"))
+        with transaction.atomic():
+            release_image(instance.image_public_id)
+            instance.delete()
+        invalidate_tags("posts")
 
 
 class AdminPostUploadImageView(APIView):
@@ -104,11 +145,16 @@ class AdminPostUploadImageView(APIView):
         if not file:
             return Response({"error": "No file provided"}, status=status.HTTP_400_BAD_REQUEST)
 
-        delete_image(post.image_public_id)
-        result = upload_image(file, folder="befa/posts")
-        post.image_url = result["url"]
-        post.image_public_id = result["public_id"]
-        post.save()
-        invalidate(cache_key("post_list"))
+        if wants_async(request):
+            # The old image is removed by the job once the new one is live
+            return accepted(enqueue_upload(file, "befa/posts", "post", post.pk, request.user))
+
+        result = store_image(file, folder="befa/posts")
+        with transaction.atomic():
+            release_image(post.image_public_id)
+            post.image_url = result["url"]
+            post.image_public_id = result["public_id"]
+            post.save()
+        invalidate_tags("posts")
 
         return Response({"url": result["url"], "public_id": result["public_id"]})
@@ -0,0 +1,64 @@
+"""
+Populate every cached_view endpoint so the first visitors after a deploy
+don't pay for cold queries.
+
+    python manage.py warm_cache [--workers 4]
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from utils.cache import cached_endpoints
+from utils.permissions import IsAdminUser
+
+
+def warm_endpoint(path, view_class, staff_user=None):
+    """GET one endpoint in-process. Returns (status_code, elapsed_ms)."""
+    request = APIRequestFactory().get(path)
+    if staff_user is not None:
+        force_authenticate(request, user=staff_user)
+    started = time.perf_counter()
+    try:
+        response = view_class.as_view()(request)
+        return response.status_code, (time.perf_counter() - started) * 1000
+    finally:
+        connection.close()
+
+
+def warm_all(workers=4, log=None):
+    """Warm every cached endpoint in parallel; returns [(path, status, ms)]."""
+    staff_user = (
+        get_user_model().objects.filter(is_staff=True, is_active=True).order_by("pk").first()
+    )
+    jobs = []
+    for path, view_class in cached_endpoints():
+        needs_staff = IsAdminUser in getattr(view_class, "permission_classes", ())
+        if needs_staff and staff_user is None:
+            if log:
+                log(f"skip {path}: no active staff user to authenticate as")
+            continue
+        jobs.append((path, view_class, staff_user if needs_staff else None))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [(job[0], pool.submit(warm_endpoint, *job)) for job in jobs]
+        return [(path, *future.result()) for path, future in futures]
+
+
+class Command(BaseCommand):
+    help = "Warm the cache for every cached_view endpoint and report per-endpoint timing."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4, help="Parallel requests (default 4).")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        results = warm_all(workers=options["workers"], log=self.stderr.write)
+        for path, status_code, elapsed_ms in results:
+            line = f"{status_code}  {elapsed_ms:8.1f} ms  {path}"
+            self.stdout.write(self.style.SUCCESS(line) if status_code < 400 else self.style.WARNING(line))
+        total_ms = (time.perf_counter() - started) * 1000
+        self.stdout.write(f"Warmed {len(results)} endpoints in {total_ms:.1f} ms")
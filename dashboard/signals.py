@@ -0,0 +1,29 @@
+import logging
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+
+logger = logging.getLogger("befa.cache")
+
+
+def _last_migrated_app():
+    # post_migrate goes out once per app with a models module, in
+    # INSTALLED_APPS order (dashboard has none, so it never gets one)
+    return [config for config in apps.get_app_configs() if config.models_module is not None][-1]
+
+
+@receiver(post_migrate, dispatch_uid="dashboard.warm_cache_after_migrate")
+def warm_cache_after_migrate(sender, **kwargs):
+    """Optionally warm cached endpoints once migrate finishes (CACHE_WARM_ON_MIGRATE)."""
+    if not settings.CACHE_WARM_ON_MIGRATE or sender is not _last_migrated_app():
+        return
+
+    from dashboard.management.commands.warm_cache import warm_all
+
+    try:
+        for path, status_code, elapsed_ms in warm_all(log=logger.warning):
+            logger.info("Warmed %s (%s) in %.1f ms", path, status_code, elapsed_ms)
+    except Exception:
+        logger.exception("Cache warm-up after migrate failed")
@@ -0,0 +1,18 @@
+from unittest import mock
+
+from django.core.management.sql import emit_post_migrate_signal
+from django.test import TestCase, override_settings
+
+
+class WarmCacheAfterMigrateTests(TestCase):
+    @override_settings(CACHE_WARM_ON_MIGRATE=True)
+    @mock.patch("dashboard.management.commands.warm_cache.warm_all", return_value=[])
+    def test_warms_once_after_migrate(self, warm_all):
+        emit_post_migrate_signal(verbosity=0, interactive=False, db="default")
+        warm_all.assert_called_once()
+
+    @override_settings(CACHE_WARM_ON_MIGRATE=False)
+    @mock.patch("dashboard.management.commands.warm_cache.warm_all", return_value=[])
+    def test_disabled_by_default(self, warm_all):
+        emit_post_migrate_signal(verbosity=0, interactive=False, db="default")
+        warm_all.assert_not_called()
@@ -1,8 +1,10 @@
 from django.urls import path
-from .views import DashboardStatsView, RecentPlayersView, PositionBreakdownView
+from .views import DashboardStatsView, RecentPlayersView, PositionBreakdownView, AgeGroupBreakdownView, CacheStatsView
 
 urlpatterns = [
     path("stats/", DashboardStatsView.as_view(), name="dashboard-stats"),
     path("recent-players/", RecentPlayersView.as_view(), name="dashboard-recent"),
     path("position-breakdown/", PositionBreakdownView.as_view(), name="dashboard-positions"),
+    path("age-groups/", AgeGroupBreakdownView.as_view(), name="dashboard-age-groups"),
+    path("cache-stats/", CacheStatsView.as_view(), name="dashboard-cache-stats"),
 ]
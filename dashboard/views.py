@@ -1,11 +1,13 @@
 from django.db.models import Count, Avg
 from django.utils import timezone
+from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from utils.cache import cached_view, cache_key, CACHE_TTL
+from utils.cache_metrics import metrics
 from utils.permissions import IsAdminUser
-from players.models import Player
+from players.models import AGE_GROUPS, SENIOR, Player
 from players.serializers import PlayerListSerializer
 from content_hub.models import Post
 from schedule.models import Event
@@ -19,6 +21,7 @@ class DashboardStatsView(APIView):
     @cached_view(
         key_func=lambda self, req: cache_key("dashboard_stats"),
         timeout=CACHE_TTL["short"],
+        tags=["players", "posts", "events"],
     )
     def get(self, request):
         now = timezone.now()
@@ -49,9 +52,10 @@ class RecentPlayersView(APIView):
     @cached_view(
         key_func=lambda self, req: cache_key("recent_players"),
         timeout=CACHE_TTL["short"],
+        tags=["players"],
     )
     def get(self, request):
-        players = Player.objects.order_by("-created_at")[:5]
+        players = Player.objects.with_age_group().order_by("-created_at")[:5]
         return Response(PlayerListSerializer(players, many=True).data)
 
 
@@ -61,6 +65,7 @@ class PositionBreakdownView(APIView):
     @cached_view(
         key_func=lambda self, req: cache_key("position_breakdown"),
         timeout=CACHE_TTL["medium"],
+        tags=["players"],
     )
     def get(self, request):
         breakdown = (
@@ -75,3 +80,34 @@ class PositionBreakdownView(APIView):
             for item in breakdown
         ]
         return Response(result)
+
+
+class AgeGroupBreakdownView(APIView):
+    """Players per academy age group, counted in a single aggregate query."""
+    permission_classes = [IsAdminUser]
+
+    @cached_view(
+        # Ages move with the calendar, so the entry is per day as well
+        key_func=lambda self, req: cache_key("age_group_breakdown", timezone.localdate()),
+        timeout=CACHE_TTL["medium"],
+        tags=["players"],
+    )
+    def get(self, request):
+        counts = Player.objects.age_group_counts()
+        labels = [name for name, _ in AGE_GROUPS] + [SENIOR, "unknown"]
+        return Response([{"label": label, "count": counts[label]} for label in labels])
+
+
+class CacheStatsView(APIView):
+    """
+    GET    /api/admin/dashboard/cache-stats/ — cached_view counters per key family
+    DELETE /api/admin/dashboard/cache-stats/ — reset the counters
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(metrics.snapshot())
+
+    def delete(self, request):
+        metrics.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -1,21 +1,23 @@
 from rest_framework import serializers
+
+from utils.fieldsets import SparseFieldsetMixin
 from .models import Product, Cart, Order
 
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Product
         fields = ["id", "name", "price", "size", "image_url", "description", "in_stock", "created_at"]
 
 
-class ProductAdminSerializer(serializers.ModelSerializer):
+class ProductAdminSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Product
         fields = "__all__"
         read_only_fields = ["id", "created_at"]
 
 
-class CartSerializer(serializers.ModelSerializer):
+class CartSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     product = ProductSerializer(read_only=True)
     product_id = serializers.PrimaryKeyRelatedField(
         queryset=Product.objects.all(), source="product", write_only=True
@@ -26,7 +28,7 @@ class CartSerializer(serializers.ModelSerializer):
         fields = ["id", "product", "product_id", "quantity", "created_at"]
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     products = ProductSerializer(many=True, read_only=True)
     product_ids = serializers.ListField(child=serializers.IntegerField(), write_only=True)
     user = serializers.StringRelatedField(read_only=True)
@@ -36,7 +38,7 @@ class OrderSerializer(serializers.ModelSerializer):
         fields = ["id", "products", "product_ids", "user", "status", "created_at"]
 
 
-class OrderAdminSerializer(serializers.ModelSerializer):
+class OrderAdminSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     products = ProductSerializer(many=True, read_only=True)
     user = serializers.StringRelatedField(read_only=True)
 
@@ -1,7 +1,7 @@
 from django.urls import path
 from e_commerce.views import (
     AdminProductListCreateView, AdminProductDetailView, AdminProductUploadImageView,
-    AdminOrderListView, AdminOrderUpdateView,
+    AdminOrderListView, AdminOrderExportView, AdminOrderUpdateView,
 )
 
 urlpatterns = [
@@ -9,5 +9,6 @@ urlpatterns = [
     path("products/<int:pk>/", AdminProductDetailView.as_view(), name="admin-product-detail"),
     path("products/<int:pk>/upload-image/", AdminProductUploadImageView.as_view(), name="admin-product-upload"),
     path("orders/", AdminOrderListView.as_view(), name="admin-order-list"),
+    path("orders/export/", AdminOrderExportView.as_view(), name="admin-order-export"),
     path("orders/<int:pk>/", AdminOrderUpdateView.as_view(), name="admin-order-update"),
 ]
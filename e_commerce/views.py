@@ -1,14 +1,20 @@
 import urllib.parse
 
 from django.conf import settings
+from django.db import transaction
 from rest_framework import generics, serializers as drf_serializers, status
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from utils.cache import cached_view, cache_key, invalidate, CACHE_TTL
+from utils.cache import cached_view, query_key, invalidate_tags, CACHE_TTL
+from utils.export import ExportMixin
+from utils.fieldsets import SparseFieldsetViewMixin
+from utils.pagination import OptionalPageNumberPagination
 from utils.permissions import IsAdminUser
-from utils.cloudinary_service import upload_image, delete_image
+from uploads.assets import release_image, store_image
+from uploads.jobs import enqueue_upload, wants_async
+from uploads.views import accepted
 from .models import Product, Cart, Order
 from .serializers import (
     ProductSerializer,
@@ -22,24 +28,28 @@ from .serializers import (
 # ═══════════════════ PUBLIC ═══════════════════
 
 
-class ProductListView(generics.ListAPIView):
+class ProductListView(SparseFieldsetViewMixin, generics.ListAPIView):
     serializer_class = ProductSerializer
     permission_classes = [AllowAny]
+    pagination_class = OptionalPageNumberPagination
+    search_fields = ["name"]
+    filterset_fields = ["size"]
+    ordering_fields = ["name", "price", "created_at"]
 
     def get_queryset(self):
         return Product.objects.filter(in_stock=True)
 
     @cached_view(
-        key_func=lambda self, req: cache_key("product_list"),
+        key_func=query_key("product_list"),
         timeout=CACHE_TTL["medium"],
+        tags=["products"],
+        prerender=True,
     )
     def get(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return self.list(request, *args, **kwargs)
 
 
-class ProductDetailView(generics.RetrieveAPIView):
+class ProductDetailView(SparseFieldsetViewMixin, generics.RetrieveAPIView):
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
     permission_classes = [AllowAny]
@@ -53,7 +63,7 @@ class CartAddView(generics.CreateAPIView):
         serializer.save(user=self.request.user)
 
 
-class CartListView(generics.ListAPIView):
+class CartListView(SparseFieldsetViewMixin, generics.ListAPIView):
     serializer_class = CartSerializer
     permission_classes = [IsAuthenticated]
 
@@ -87,7 +97,7 @@ class OrderCreateView(generics.CreateAPIView):
         return Response(response.data)
 
 
-class OrderListView(generics.ListAPIView):
+class OrderListView(SparseFieldsetViewMixin, generics.ListAPIView):
     serializer_class = OrderSerializer
     permission_classes = [IsAuthenticated]
 
@@ -98,29 +108,30 @@ class OrderListView(generics.ListAPIView):
 # ═══════════════════ ADMIN ═══════════════════
 
 
-class AdminProductListCreateView(generics.ListCreateAPIView):
+class AdminProductListCreateView(SparseFieldsetViewMixin, generics.ListCreateAPIView):
     permission_classes = [IsAdminUser]
     serializer_class = ProductAdminSerializer
     queryset = Product.objects.all()
 
     def perform_create(self, serializer):
         serializer.save()
-        invalidate(cache_key("product_list"), cache_key("dashboard_stats"))
+        invalidate_tags("products")
 
 
-class AdminProductDetailView(generics.RetrieveUpdateDestroyAPIView):
+class AdminProductDetailView(SparseFieldsetViewMixin, generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAdminUser]
     serializer_class = ProductAdminSerializer
     queryset = Product.objects.all()
 
     def perform_update(self, serializer):
         serializer.save()
-        invalidate(cache_key("product_list"))
+        invalidate_tags("products")
 
     def perform_destroy(self, instance):
-        delete_image(instance.image_public_id)
-        instance.delete()
-        invalidate(cache_key("product_list"), cache_key("dashboard_stats"))
+        with transaction.atomic():
+            release_image(instance.image_public_id)
+            instance.delete()
+        invalidate_tags("products")
 
 
 class AdminProductUploadImageView(APIView):
@@ -136,19 +147,56 @@ class AdminProductUploadImageView(APIView):
         if not file:
             return Response({"error": "No file provided"}, status=status.HTTP_400_BAD_REQUEST)
 
-        delete_image(product.image_public_id)
-        result = upload_image(file, folder="befa/products")
-        product.image_url = result["url"]
-        product.image_public_id = result["public_id"]
-        product.save()
-        invalidate(cache_key("product_list"))
+        if wants_async(request):
+            # The old image is removed by the job once the new one is live
+            return accepted(enqueue_upload(file, "befa/products", "product", product.pk, request.user))
+
+        result = store_image(file, folder="befa/products")
+        with transaction.atomic():
+            release_image(product.image_public_id)
+            product.image_url = result["url"]
+            product.image_public_id = result["public_id"]
+            product.save()
+        invalidate_tags("products")
         return Response({"url": result["url"], "public_id": result["public_id"]})
 
 
-class AdminOrderListView(generics.ListAPIView):
+class AdminOrderListView(SparseFieldsetViewMixin, generics.ListAPIView):
     permission_classes = [IsAdminUser]
     serializer_class = OrderAdminSerializer
-    queryset = Order.objects.prefetch_related("products").all()
+    queryset = Order.objects.select_related("user").prefetch_related("products").all()
+    search_fields = ["user__email"]
+    filterset_fields = ["status"]
+    ordering_fields = ["created_at", "status"]
+
+
+class AdminOrderExportView(ExportMixin, AdminOrderListView):
+    """
+    GET /api/admin/orders/export/?type=csv|xlsx
+    The order list as a file, with the same filters as the list.
+    """
+    export_filename = "orders"
+    export_columns = [
+        ("Order ID", "id"),
+        ("Customer", "user__email"),
+        ("Status", "status"),
+        ("Products", "products"),
+        ("Total (₦)", "total"),
+        ("Placed", "created_at"),
+    ]
+
+    def export_rows(self, queryset):
+        # prefetch_related runs once per chunk when iterator() has a chunk_size
+        for order in queryset.iterator(chunk_size=self.export_chunk_size):
+            products = order.products.all()
+            yield (
+                order.id,
+                order.user.email,
+                order.get_status_display(),
+                [f"{product.name} ({product.size})" for product in products],
+                sum(product.price for product in products),
+                order.created_at,
+            )
 
 
 class AdminOrderUpdateView(generics.UpdateAPIView):
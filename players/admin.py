@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Player
+from .models import Player, PlayerMatchStat
 
 
 @admin.register(Player)
@@ -8,3 +8,21 @@ class PlayerAdmin(admin.ModelAdmin):
     list_filter = ("admission_status", "soccer_position", "is_player_of_the_month")
     search_fields = ("surname", "other_name", "parent_guardian_name")
     ordering = ("-created_at",)
+
+
+@admin.register(PlayerMatchStat)
+class PlayerMatchStatAdmin(admin.ModelAdmin):
+    list_display = ("player", "event", "goals", "assists", "saves", "clean_sheet")
+    list_select_related = ("player", "event")
+    raw_id_fields = ("player", "event")
+
+    # Read-only: sheets go through the match-sheet endpoint so the player
+    # totals move with them.
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
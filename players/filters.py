@@ -0,0 +1,162 @@
+"""
+Filters and filter backends for the admin player list.
+"""
+import json
+import re
+from collections import Counter
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+from django_filters import rest_framework as django_filters
+from rest_framework import filters
+
+from .models import AGE_GROUP_CHOICES, MAX_TAG_LENGTH, Player
+
+SEARCH_COLUMNS = ("surname", "other_name", "middle_name", "parent_guardian_name")
+# InnoDB FULLTEXT ignores shorter words (innodb_ft_min_token_size default)
+MYSQL_MIN_TOKEN_SIZE = 3
+
+
+class PlayerSearchFilter(filters.SearchFilter):
+    """
+    Indexed, ranked search over player and guardian names.
+
+    PostgreSQL: prefix full-text match on the generated search_vector column
+    (GIN) OR trigram word similarity on the names (GIN, pg_trgm) for typo
+    tolerance, ranked by ts_rank + similarity. MySQL: FULLTEXT boolean-mode
+    prefix match ranked by relevance, unless a word is too short for the
+    FULLTEXT index. Anything else: the stock ILIKE search.
+    See migration 0002_player_search_indexes.
+
+    Results are ordered by rank unless the client asks for ?ordering=, so
+    list this backend after OrderingFilter.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        words = [re.sub(r"\W", "", term) for term in self.get_search_terms(request)]
+        words = [word for word in words if word]
+        if not words:
+            return super().filter_queryset(request, queryset, view)
+
+        vendor = connections[queryset.db].vendor
+        if vendor == "postgresql":
+            queryset = self._postgres(queryset, words)
+        elif vendor == "mysql" and min(map(len, words)) >= MYSQL_MIN_TOKEN_SIZE:
+            queryset = self._mysql(queryset, words)
+        else:
+            return super().filter_queryset(request, queryset, view)
+
+        if not request.query_params.get(self._ordering_param(view)):
+            queryset = queryset.order_by("-search_rank", "-created_at")
+        return queryset
+
+    @staticmethod
+    def _ordering_param(view):
+        for backend in getattr(view, "filter_backends", ()):
+            if issubclass(backend, filters.OrderingFilter):
+                return backend.ordering_param
+        return filters.OrderingFilter.ordering_param
+
+    def _postgres(self, queryset, words):
+        table = queryset.model._meta.db_table
+        names = " || ' ' || ".join(f'"{table}"."{column}"' for column in SEARCH_COLUMNS)
+        tsquery = " & ".join(f"{word}:*" for word in words)
+        text = " ".join(words)
+        return queryset.annotate(
+            search_rank=RawSQL(
+                f"ts_rank(\"{table}\".search_vector, to_tsquery('simple', %s)) "
+                f"+ word_similarity(%s, {names})",
+                (tsquery, text),
+                output_field=FloatField(),
+            )
+        ).filter(
+            RawSQL(
+                f"(\"{table}\".search_vector @@ to_tsquery('simple', %s) OR %s <%% ({names}))",
+                (tsquery, text),
+                output_field=BooleanField(),
+            )
+        )
+
+    def _mysql(self, queryset, words):
+        table = queryset.model._meta.db_table
+        match = "MATCH({}) AGAINST (%s IN BOOLEAN MODE)".format(
+            ", ".join(f"`{table}`.`{column}`" for column in SEARCH_COLUMNS)
+        )
+        against = " ".join(f"+{word}*" for word in words)
+        return queryset.annotate(
+            search_rank=RawSQL(match, (against,), output_field=FloatField())
+        ).filter(RawSQL(match, (against,), output_field=BooleanField()))
+
+
+
+def json_array_contains(queryset, field, value):
+    """
+    Rows whose JSON array `field` holds the string `value`, using the
+    indexes from migration 0006: GIN (jsonb_path_ops) containment on
+    PostgreSQL, MEMBER OF on MySQL (multi-valued index on weaknesses), a
+    text match elsewhere.
+    """
+    vendor = connections[queryset.db].vendor
+    if vendor == "postgresql":
+        return queryset.filter(**{f"{field}__contains": [value]})
+    if vendor == "mysql":
+        table = queryset.model._meta.db_table
+        return queryset.filter(RawSQL(
+            f"%s MEMBER OF(`{table}`.`{field}`->'$')", (value,), output_field=BooleanField()
+        ))
+    return queryset.filter(**{f"{field}__icontains": json.dumps(value)})
+
+
+def weakness_tags(using="default"):
+    """[(tag, players with it), ...] across all players, sorted by tag."""
+    table = Player._meta.db_table
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        sql = (
+            f"SELECT tag, COUNT(DISTINCT {table}.id) FROM {table}, jsonb_array_elements_text(weaknesses) AS tag "
+            f"WHERE jsonb_typeof(weaknesses) = 'array' GROUP BY tag ORDER BY tag"
+        )
+    elif connection.vendor == "mysql":
+        sql = (
+            f"SELECT jt.tag, COUNT(DISTINCT `{table}`.`id`) FROM `{table}`, JSON_TABLE(`{table}`.`weaknesses`, "
+            f"'$[*]' COLUMNS (tag VARCHAR({MAX_TAG_LENGTH}) PATH '$')) AS jt "
+            f"WHERE jt.tag IS NOT NULL GROUP BY jt.tag ORDER BY jt.tag"
+        )
+    else:
+        counts = Counter()
+        for weaknesses in Player.objects.using(using).values_list("weaknesses", flat=True).iterator():
+            if isinstance(weaknesses, list):
+                counts.update({str(tag) for tag in weaknesses})
+        return sorted(counts.items())
+    with connection.cursor() as cursor:
+        cursor.execute(sql)
+        return [(tag, count) for tag, count in cursor.fetchall()]
+
+
+class PlayerFilter(django_filters.FilterSet):
+    """
+    Exact-match list filters plus ?age_group=U13 (a date_of_birth range),
+    ?weakness= / ?achievement= (array membership) and ?has_achievements=.
+    """
+    age_group = django_filters.ChoiceFilter(choices=AGE_GROUP_CHOICES, method="filter_age_group")
+    weakness = django_filters.CharFilter(method="filter_json_array", field_name="weaknesses")
+    achievement = django_filters.CharFilter(method="filter_json_array", field_name="achievements")
+    has_achievements = django_filters.BooleanFilter(method="filter_has_achievements")
+
+    class Meta:
+        model = Player
+        fields = [
+            "soccer_position", "admission_status", "team", "age_group",
+            "weakness", "achievement", "has_achievements",
+        ]
+
+    def filter_age_group(self, queryset, name, value):
+        return queryset.age_group(value)
+
+    def filter_json_array(self, queryset, name, value):
+        return json_array_contains(queryset, name, value)
+
+    def filter_has_achievements(self, queryset, name, value):
+        empty = Q(achievements__isnull=True) | Q(achievements=[])
+        return queryset.exclude(empty) if value else queryset.filter(empty)
@@ -0,0 +1,138 @@
+"""
+Bulk import of player registrations from CSV / XLSX.
+
+Rows are streamed from the file (csv module / openpyxl read-only mode),
+validated with PlayerAdminSerializer rules and inserted with bulk_create in
+batches, so memory stays bounded by the batch size. bulk_create skips the
+post_save receivers, so caches are invalidated once at the end instead of
+once per row.
+"""
+import codecs
+import csv
+import json
+from datetime import datetime
+
+from django.db import transaction
+
+from utils.cache import invalidate_tags
+from .models import Player
+from .serializers import PlayerAdminSerializer
+
+BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 1000
+LIST_FIELDS = ("weaknesses", "achievements")
+
+
+class ImportFormatError(ValueError):
+    """The file itself cannot be read (bad format, missing dependency)."""
+
+
+def _normalize_header(name):
+    return str(name or "").strip().lower().replace(" ", "_")
+
+
+def iter_rows(fileobj, filename):
+    """Yield one dict per data row, keyed by normalized header names."""
+    if filename.lower().endswith(".xlsx"):
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise ImportFormatError("XLSX import requires the openpyxl package.")
+        try:
+            workbook = load_workbook(fileobj, read_only=True, data_only=True)
+        except Exception as e:
+            raise ImportFormatError(f"Could not read XLSX file: {e}")
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [_normalize_header(cell) for cell in next(rows, ())]
+            for values in rows:
+                yield dict(zip(header, values))
+        finally:
+            workbook.close()
+    elif filename.lower().endswith(".csv"):
+        reader = csv.reader(codecs.iterdecode(fileobj, "utf-8-sig"))
+        try:
+            header = [_normalize_header(cell) for cell in next(reader, ())]
+            for values in reader:
+                yield dict(zip(header, values))
+        except UnicodeDecodeError:
+            raise ImportFormatError(
+                f"Line {reader.line_num + 1} is not valid UTF-8; save the CSV as UTF-8 and retry."
+            )
+        except csv.Error as e:
+            raise ImportFormatError(f"Could not read CSV line {reader.line_num}: {e}")
+    else:
+        raise ImportFormatError("Unsupported file type; upload a .csv or .xlsx file.")
+
+
+def clean_row(row):
+    """
+    Turn spreadsheet cells into serializer input: blanks are dropped (model
+    defaults apply), XLSX datetimes become dates, and list fields accept
+    either JSON or "a; b; c".
+    """
+    data = {}
+    for field, value in row.items():
+        if not field or value is None:
+            continue
+        if isinstance(value, datetime):
+            value = value.date()
+        if isinstance(value, str):
+            value = value.strip()
+            if value == "":
+                continue
+            if field in LIST_FIELDS:
+                if value.startswith("["):
+                    try:
+                        value = json.loads(value)
+                    except ValueError:
+                        pass
+                else:
+                    value = [item.strip() for item in value.split(";") if item.strip()]
+        data[field] = value
+    return data
+
+
+def import_players(fileobj, filename, batch_size=BATCH_SIZE, dry_run=False):
+    """
+    Import players from an open binary file. Returns a report:
+    {"created": n, "valid": n, "failed": n, "errors": [{"row": line, "errors": {...}}]}
+    Valid rows are imported even if others fail; dry_run validates only
+    (created stays 0). An unreadable file raises ImportFormatError, naming
+    how many rows before the bad line were already imported.
+    """
+    report = {"created": 0, "valid": 0, "failed": 0, "errors": []}
+    batch = []
+
+    def flush():
+        if batch and not dry_run:
+            with transaction.atomic():
+                Player.objects.bulk_create(batch, batch_size=batch_size)
+            report["created"] += len(batch)
+        batch.clear()
+
+    try:
+        # Row 1 is the header, so data rows start at line 2
+        for line, row in enumerate(iter_rows(fileobj, filename), start=2):
+            data = clean_row(row)
+            if not data:
+                continue
+            serializer = PlayerAdminSerializer(data=data)
+            if not serializer.is_valid():
+                report["failed"] += 1
+                if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                    report["errors"].append({"row": line, "errors": serializer.errors})
+                continue
+            report["valid"] += 1
+            batch.append(Player(**serializer.validated_data))
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+    except ImportFormatError as e:
+        if report["created"]:
+            raise ImportFormatError(f"{e} ({report['created']} rows before it were imported.)")
+        raise
+    finally:
+        if report["created"]:
+            invalidate_tags("players", "leaderboard")
+    return report
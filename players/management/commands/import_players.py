@@ -0,0 +1,39 @@
+"""
+Bulk-import player registrations from a CSV or XLSX file.
+
+    python manage.py import_players registrations.xlsx [--batch-size 500] [--dry-run]
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from players.importers import BATCH_SIZE, ImportFormatError, import_players
+
+
+class Command(BaseCommand):
+    help = "Import players from a .csv or .xlsx file (header row = Player field names)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="Validate without saving.")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["path"], "rb") as fileobj:
+                report = import_players(
+                    fileobj,
+                    options["path"],
+                    batch_size=options["batch_size"],
+                    dry_run=options["dry_run"],
+                )
+        except (OSError, ImportFormatError) as e:
+            raise CommandError(str(e))
+
+        for error in report["errors"]:
+            self.stderr.write(f"row {error['row']}: {json.dumps(error['errors'])}")
+        if options["dry_run"]:
+            summary = f"Validated {report['valid']} players"
+        else:
+            summary = f"Imported {report['created']} players"
+        self.stdout.write(self.style.SUCCESS(f"{summary}, {report['failed']} rows failed."))
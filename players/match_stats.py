@@ -0,0 +1,119 @@
+"""
+Match sheets and the Player season totals they feed.
+
+A sheet is saved as the difference from what is already stored: new,
+changed and removed rows become per-player deltas, and all totals are
+moved in a single UPDATE ... SET goals = CASE WHEN id = … THEN goals + n
+… END. Totals therefore stay consistent with the sheets without ever
+being recomputed, and a 22-player sheet costs a handful of queries.
+"""
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Coalesce, NullIf
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from utils.cache import invalidate_tags
+from .models import Player, PlayerMatchStat
+
+# Player total <- PlayerMatchStat column ("matches" counts appearances)
+TOTALS = {"goals": "goals", "assists": "assists", "saves": "saves", "clean_sheets": "clean_sheet"}
+SHEET_FIELDS = ("goals", "assists", "saves", "clean_sheet")
+
+
+def _contribution(row):
+    """What one match-sheet row adds to its player's totals."""
+    if row is None:
+        return dict.fromkeys(("matches", *TOTALS), 0)
+    contribution = {"matches": 1}
+    for total, column in TOTALS.items():
+        contribution[total] = int(getattr(row, column) or 0)
+    return contribution
+
+
+def apply_deltas(deltas):
+    """
+    Move Player totals by {player_id: {"goals": +1, ...}} in one UPDATE.
+    saves / clean_sheets are nullable (outfield players): NULL counts as 0,
+    and a correction that brings them back to 0 stores NULL again, so an
+    outfield player never shows up on those leaderboards with 0.
+    """
+    updates = {}
+    for field in ("matches", *TOTALS):
+        nullable = Player._meta.get_field(field).null
+        whens = []
+        for player_id, delta in deltas.items():
+            if not delta[field]:
+                continue
+            value = Coalesce(F(field), Value(0)) + Value(delta[field])
+            if nullable and delta[field] < 0:
+                value = NullIf(value, Value(0))
+            whens.append(When(pk=player_id, then=value))
+        if whens:
+            updates[field] = Case(*whens, default=F(field))
+    if not updates:
+        return 0
+    updated = Player.objects.filter(pk__in=list(deltas)).update(**updates, updated_at=timezone.now())
+    # update() skips post_save, so refresh the player caches here
+    invalidate_tags("players", "leaderboard")
+    return updated
+
+
+def save_match_sheet(event, rows):
+    """
+    Replace the sheet for a match event with rows (validated dicts with
+    "player" ids) and roll the changes into the player totals.
+    """
+    with transaction.atomic():
+        # Serialize submissions for the same match so deltas never overlap
+        event = type(event).objects.select_for_update().get(pk=event.pk)
+        existing = {stat.player_id: stat for stat in event.player_stats.select_for_update()}
+
+        wanted = {row["player"]: row for row in rows}
+        known = set(Player.objects.filter(pk__in=wanted).values_list("pk", flat=True))
+        unknown = sorted(set(wanted) - known)
+        if unknown:
+            raise ValidationError({"players": f"Unknown player ids: {unknown}"})
+
+        deltas, created, changed = {}, [], []
+        for player_id, row in wanted.items():
+            stat = existing.get(player_id)
+            before = _contribution(stat)
+            if stat is None:
+                stat = PlayerMatchStat(event=event, player_id=player_id)
+                created.append(stat)
+            elif any(getattr(stat, field) != row.get(field) for field in SHEET_FIELDS):
+                changed.append(stat)
+            else:
+                continue
+            for field in SHEET_FIELDS:
+                setattr(stat, field, row.get(field))
+            after = _contribution(stat)
+            deltas[player_id] = {key: after[key] - before[key] for key in after}
+
+        removed = [stat for player_id, stat in existing.items() if player_id not in wanted]
+        for stat in removed:
+            deltas[stat.player_id] = {key: -value for key, value in _contribution(stat).items()}
+
+        if created:
+            PlayerMatchStat.objects.bulk_create(created)
+        if changed:
+            now = timezone.now()
+            for stat in changed:
+                stat.updated_at = now
+            PlayerMatchStat.objects.bulk_update(changed, [*SHEET_FIELDS, "updated_at"])
+        if removed:
+            PlayerMatchStat.objects.filter(pk__in=[stat.pk for stat in removed]).delete()
+        apply_deltas(deltas)
+
+    return {"created": len(created), "updated": len(changed), "removed": len(removed)}
+
+
+def roll_back_match(event):
+    """Take a match's sheet out of the totals (called before it is deleted)."""
+    deltas = {
+        stat.player_id: {key: -value for key, value in _contribution(stat).items()}
+        for stat in event.player_stats.all()
+    }
+    if deltas:
+        apply_deltas(deltas)
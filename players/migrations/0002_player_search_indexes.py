@@ -0,0 +1,54 @@
+"""
+Search indexes for the admin player search (players.filters.PlayerSearchFilter).
+
+PostgreSQL: a generated tsvector column with a GIN index for full-text
+matching, plus a pg_trgm GIN index over the same names for typo-tolerant
+matching. MySQL: a FULLTEXT index. Other backends fall back to ILIKE.
+"""
+from django.db import migrations
+
+SEARCH_COLUMNS = ("surname", "other_name", "middle_name", "parent_guardian_name")
+NAME_EXPR = " || ' ' || ".join(SEARCH_COLUMNS)
+
+
+def create_search_indexes(apps, schema_editor):
+    table = apps.get_model("players", "Player")._meta.db_table
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        schema_editor.execute(
+            f"ALTER TABLE {table} ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS (to_tsvector('simple', {NAME_EXPR})) STORED"
+        )
+        schema_editor.execute(
+            f"CREATE INDEX idx_player_search ON {table} USING gin (search_vector)"
+        )
+        schema_editor.execute(
+            f"CREATE INDEX idx_player_name_trgm ON {table} USING gin (({NAME_EXPR}) gin_trgm_ops)"
+        )
+    elif vendor == "mysql":
+        schema_editor.execute(
+            f"ALTER TABLE {table} ADD FULLTEXT INDEX idx_player_fulltext ({', '.join(SEARCH_COLUMNS)})"
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    table = apps.get_model("players", "Player")._meta.db_table
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS idx_player_name_trgm")
+        schema_editor.execute("DROP INDEX IF EXISTS idx_player_search")
+        schema_editor.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
+    elif vendor == "mysql":
+        schema_editor.execute(f"ALTER TABLE {table} DROP INDEX idx_player_fulltext")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("players", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
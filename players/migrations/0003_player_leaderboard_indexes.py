@@ -0,0 +1,29 @@
+# Generated by Django 5.2.3 on 2026-10-18 09:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('players', '0002_player_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['admission_status', '-goals'], name='idx_player_lb_goals'),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['admission_status', '-assists'], name='idx_player_lb_assists'),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['admission_status', '-rating'], name='idx_player_lb_rating'),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['admission_status', '-clean_sheets'], name='idx_player_lb_clean_sheets'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.3 on 2026-10-18 09:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('players', '0003_player_leaderboard_indexes'),
+        ('schedule', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerMatchStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('goals', models.PositiveSmallIntegerField(default=0)),
+                ('assists', models.PositiveSmallIntegerField(default=0)),
+                ('saves', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('clean_sheet', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('event', models.ForeignKey(limit_choices_to={'event_type': 'match'}, on_delete=django.db.models.deletion.CASCADE, related_name='player_stats', to='schedule.event')),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='match_stats', to='players.player')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['player', 'event'], name='idx_match_stat_player')],
+                'constraints': [models.UniqueConstraint(fields=('event', 'player'), name='uniq_match_stat_event_player')],
+            },
+        ),
+    ]
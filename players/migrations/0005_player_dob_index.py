@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-18 09:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('players', '0004_player_match_stat'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['date_of_birth'], name='idx_player_dob'),
+        ),
+    ]
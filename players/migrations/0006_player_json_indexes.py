@@ -0,0 +1,49 @@
+"""
+Indexes for filtering players by JSON array entries (players.filters.PlayerFilter).
+
+PostgreSQL: GIN (jsonb_path_ops) indexes on weaknesses and achievements
+for @> containment. MySQL 8.0.17+: a multi-valued index over the
+weaknesses array for MEMBER OF; achievements entries are free-form so
+they are not indexed there. Other backends scan.
+"""
+from django.db import migrations
+
+MAX_TAG_LENGTH = 100
+
+
+def create_json_indexes(apps, schema_editor):
+    table = apps.get_model("players", "Player")._meta.db_table
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(
+            f"CREATE INDEX idx_player_weaknesses ON {table} USING gin (weaknesses jsonb_path_ops)"
+        )
+        schema_editor.execute(
+            f"CREATE INDEX idx_player_achievements ON {table} USING gin (achievements jsonb_path_ops)"
+        )
+    elif vendor == "mysql":
+        schema_editor.execute(
+            f"CREATE INDEX idx_player_weaknesses ON {table} "
+            f"((CAST(weaknesses->'$' AS CHAR({MAX_TAG_LENGTH}) ARRAY)))"
+        )
+
+
+def drop_json_indexes(apps, schema_editor):
+    table = apps.get_model("players", "Player")._meta.db_table
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS idx_player_achievements")
+        schema_editor.execute("DROP INDEX IF EXISTS idx_player_weaknesses")
+    elif vendor == "mysql":
+        schema_editor.execute(f"DROP INDEX idx_player_weaknesses ON {table}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("players", "0005_player_dob_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_json_indexes, drop_json_indexes),
+    ]
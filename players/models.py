@@ -1,4 +1,72 @@
 from django.db import models
+from django.db.models import Case, CharField, Count, Q, Value, When
+from django.utils import timezone
+
+# Stats ranked by the public leaderboard, and every field a leaderboard row
+# shows or is filtered on — only changes to these refresh the cached ranking.
+LEADERBOARD_STATS = ("goals", "assists", "rating", "clean_sheets")
+LEADERBOARD_FIELDS = LEADERBOARD_STATS + (
+    "surname", "other_name", "soccer_position", "team", "player_image", "admission_status",
+)
+
+# Longest weakness entry (bounded for MySQL's multi-valued index)
+MAX_TAG_LENGTH = 100
+
+# Academy age groups, youngest first: a player is in the first group whose
+# limit is above their age today; older players are "Senior".
+AGE_GROUPS = (("U10", 10), ("U13", 13), ("U17", 17))
+SENIOR = "Senior"
+AGE_GROUP_CHOICES = [(name, name) for name, _ in AGE_GROUPS] + [(SENIOR, SENIOR)]
+
+
+def _years_before(day, years):
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:      # 29 February
+        return day.replace(year=day.year - years, day=28)
+
+
+def age_group_ranges(today=None):
+    """
+    {group: Q on date_of_birth}. Every condition is a plain range on the
+    column, so filters and counts use idx_player_dob.
+    """
+    today = today or timezone.localdate()
+    ranges, younger_than = {}, None
+    for name, limit in AGE_GROUPS:
+        # Under `limit` today <=> born after today minus `limit` years
+        born_after = _years_before(today, limit)
+        condition = Q(date_of_birth__gt=born_after)
+        if younger_than is not None:
+            condition &= Q(date_of_birth__lte=younger_than)
+        ranges[name] = condition
+        younger_than = born_after
+    ranges[SENIOR] = Q(date_of_birth__lte=younger_than)
+    return ranges
+
+
+class PlayerQuerySet(models.QuerySet):
+    def age_group(self, name, today=None):
+        return self.filter(age_group_ranges(today)[name])
+
+    def with_age_group(self, today=None):
+        """Annotate age_group (None without a date of birth)."""
+        return self.annotate(
+            age_group=Case(
+                *[When(condition, then=Value(name)) for name, condition in age_group_ranges(today).items()],
+                default=Value(None),
+                output_field=CharField(),
+            )
+        )
+
+    def age_group_counts(self, today=None):
+        """{group: count, ..., "unknown": count} in one aggregate query."""
+        counts = {
+            name: Count("pk", filter=condition)
+            for name, condition in age_group_ranges(today).items()
+        }
+        counts["unknown"] = Count("pk", filter=Q(date_of_birth__isnull=True))
+        return self.aggregate(**counts)
 
 
 class Player(models.Model):
@@ -76,6 +144,8 @@ class Player(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = PlayerQuerySet.as_manager()
+
     class Meta:
         ordering = ["-created_at"]
         indexes = [
@@ -84,8 +154,24 @@ class Player(models.Model):
             models.Index(fields=["admission_status"], name="idx_player_admission"),
             models.Index(fields=["-created_at"], name="idx_player_created"),
             models.Index(fields=["is_player_of_the_month"], name="idx_player_potm"),
+            models.Index(fields=["date_of_birth"], name="idx_player_dob"),
+            # Leaderboards: admitted players ranked by one stat
+            models.Index(fields=["admission_status", "-goals"], name="idx_player_lb_goals"),
+            models.Index(fields=["admission_status", "-assists"], name="idx_player_lb_assists"),
+            models.Index(fields=["admission_status", "-rating"], name="idx_player_lb_rating"),
+            models.Index(fields=["admission_status", "-clean_sheets"], name="idx_player_lb_clean_sheets"),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._leaderboard_snapshot = instance.leaderboard_state()
+        return instance
+
+    def leaderboard_state(self):
+        """Loaded values of LEADERBOARD_FIELDS (deferred fields are skipped)."""
+        return {field: self.__dict__.get(field) for field in LEADERBOARD_FIELDS}
+
     def __str__(self):
         return f"{self.surname} {self.other_name} ({self.soccer_position})"
 
@@ -103,3 +189,35 @@ class Player(models.Model):
     def image(self):
         """Alias for public frontend compatibility."""
         return self.player_image
+
+
+class PlayerMatchStat(models.Model):
+    """
+    One player's line on a match sheet. Player.goals/assists/matches/saves/
+    clean_sheets are running totals of these rows, kept in step by
+    players.match_stats (never recomputed from scratch).
+    """
+    player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name="match_stats")
+    event = models.ForeignKey(
+        "schedule.Event",
+        on_delete=models.CASCADE,
+        related_name="player_stats",
+        limit_choices_to={"event_type": "match"},
+    )
+    goals = models.PositiveSmallIntegerField(default=0)
+    assists = models.PositiveSmallIntegerField(default=0)
+    saves = models.PositiveSmallIntegerField(blank=True, null=True)
+    clean_sheet = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["event", "player"], name="uniq_match_stat_event_player"),
+        ]
+        indexes = [
+            models.Index(fields=["player", "event"], name="idx_match_stat_player"),
+        ]
+
+    def __str__(self):
+        return f"{self.player} — {self.event}"
@@ -1,8 +1,10 @@
 from rest_framework import serializers
-from .models import Player
 
+from utils.fieldsets import SparseFieldsetMixin
+from .models import MAX_TAG_LENGTH, Player, PlayerMatchStat
 
-class PlayerPublicSerializer(serializers.ModelSerializer):
+
+class PlayerPublicSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Slim serializer for user-facing frontend (player spotlight)."""
     name = serializers.CharField(source='surname', read_only=True)
     position = serializers.CharField(source='soccer_position', read_only=True)
@@ -17,7 +19,19 @@ class PlayerPublicSerializer(serializers.ModelSerializer):
         ]
 
 
-class PlayerAdminSerializer(serializers.ModelSerializer):
+class PlayerLeaderboardSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """Leaderboard row: who, plus the ranked stat as "value"."""
+    name = serializers.CharField(read_only=True)
+    position = serializers.CharField(source='soccer_position', read_only=True)
+    image = serializers.URLField(source='player_image', read_only=True)
+    value = serializers.ReadOnlyField()
+
+    class Meta:
+        model = Player
+        fields = ["id", "name", "position", "team", "image", "value"]
+
+
+class PlayerAdminSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Full serializer for admin portal — all fields exposed."""
 
     class Meta:
@@ -28,16 +42,86 @@ class PlayerAdminSerializer(serializers.ModelSerializer):
     def validate_weaknesses(self, value):
         if value is not None and not isinstance(value, list):
             raise serializers.ValidationError("Weaknesses must be a list.")
+        # Entries are indexed as text (see migration 0006)
+        for item in value or ():
+            if not isinstance(item, str) or len(item) > MAX_TAG_LENGTH:
+                raise serializers.ValidationError(
+                    f"Each weakness must be text of at most {MAX_TAG_LENGTH} characters."
+                )
         return value
 
 
-class PlayerListSerializer(serializers.ModelSerializer):
+class PlayerListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Concise serializer for admin player list table."""
+    # Annotated by Player.objects.with_age_group(); None elsewhere
+    age_group = serializers.CharField(read_only=True, default=None)
 
     class Meta:
         model = Player
         fields = [
             "id", "surname", "other_name", "middle_name", "soccer_position",
             "admission_status", "player_image", "state_of_origin",
-            "date_of_birth", "created_at",
+            "date_of_birth", "age_group", "created_at",
         ]
+        field_columns = {"age_group": ("date_of_birth",)}
+
+
+class PlayerBulkUpdateSerializer(serializers.Serializer):
+    """Payload for the admin bulk action: target IDs and the values to set."""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, allow_empty=False, max_length=10000
+    )
+    admission_status = serializers.ChoiceField(choices=Player.ADMISSION_CHOICES, required=False)
+    is_player_of_the_month = serializers.BooleanField(required=False)
+
+    def validate(self, attrs):
+        if "admission_status" not in attrs and "is_player_of_the_month" not in attrs:
+            raise serializers.ValidationError(
+                "Provide admission_status and/or is_player_of_the_month."
+            )
+        return attrs
+
+
+class PlayerPhotoBatchSerializer(serializers.Serializer):
+    """Multipart squad photo upload: files[i] is the photo of player_ids[i]."""
+    MAX_FILES = 50
+
+    player_ids = serializers.ListField(child=serializers.IntegerField(min_value=1), min_length=1, max_length=MAX_FILES)
+    files = serializers.ListField(child=serializers.FileField(), min_length=1, max_length=MAX_FILES)
+
+    def validate(self, attrs):
+        ids = attrs["player_ids"]
+        if len(ids) != len(attrs["files"]):
+            raise serializers.ValidationError("Send exactly one file per player id.")
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError({"player_ids": "Each player can appear only once."})
+        return attrs
+
+
+class PlayerMatchStatSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """A stored match-sheet line."""
+    player_name = serializers.CharField(source="player.name", read_only=True)
+
+    class Meta:
+        model = PlayerMatchStat
+        fields = ["id", "player", "player_name", "goals", "assists", "saves", "clean_sheet", "updated_at"]
+
+
+class MatchSheetRowSerializer(serializers.Serializer):
+    # Plain ids: existence is checked for the whole sheet in one query
+    player = serializers.IntegerField(min_value=1)
+    goals = serializers.IntegerField(min_value=0, max_value=100, default=0)
+    assists = serializers.IntegerField(min_value=0, max_value=100, default=0)
+    saves = serializers.IntegerField(min_value=0, max_value=500, required=False, allow_null=True)
+    clean_sheet = serializers.BooleanField(default=False)
+
+
+class MatchSheetSerializer(serializers.Serializer):
+    """A whole match sheet: every player who appeared, once."""
+    players = MatchSheetRowSerializer(many=True, max_length=60)
+
+    def validate_players(self, rows):
+        ids = [row["player"] for row in rows]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError("Each player can appear only once.")
+        return rows
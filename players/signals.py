@@ -1,29 +1,36 @@
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_save, post_delete, pre_delete
 from django.dispatch import receiver
 
-from utils.cache import cache_key, invalidate
-from utils.cloudinary_service import delete_image
+from utils.cache import invalidate_tags
+from schedule.models import Event
+from uploads.assets import release_image
+from .match_stats import roll_back_match
 from .models import Player
 
 
 @receiver(post_save, sender=Player)
 def invalidate_player_cache_on_save(sender, instance, **kwargs):
-    invalidate(
-        cache_key("player_of_the_month"),
-        cache_key("featured_players"),
-        cache_key("dashboard_stats"),
-        cache_key("recent_players"),
-        cache_key("position_breakdown"),
-    )
+    # The leaderboard is only refreshed when a ranked or displayed field
+    # changed (compared with the values loaded from the database) on a
+    # player who is, or just stopped being, on it.
+    before = getattr(instance, "_leaderboard_snapshot", None)
+    after = instance.leaderboard_state()
+    instance._leaderboard_snapshot = after
+    on_leaderboard = "admitted" in (after["admission_status"], (before or {}).get("admission_status"))
+    if before != after and on_leaderboard:
+        invalidate_tags("players", "leaderboard")
+    else:
+        invalidate_tags("players")
 
 
 @receiver(post_delete, sender=Player)
 def cleanup_player_on_delete(sender, instance, **kwargs):
-    delete_image(instance.player_image_public_id)
-    invalidate(
-        cache_key("player_of_the_month"),
-        cache_key("featured_players"),
-        cache_key("dashboard_stats"),
-        cache_key("recent_players"),
-        cache_key("position_breakdown"),
-    )
+    # Queued in the delete's transaction; removed from Cloudinary after commit
+    release_image(instance.player_image_public_id)
+    invalidate_tags("players", "leaderboard")
+
+
+@receiver(pre_delete, sender=Event)
+def roll_back_match_stats_on_event_delete(sender, instance, **kwargs):
+    # Runs before the cascade removes the sheet rows
+    roll_back_match(instance)
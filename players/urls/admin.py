@@ -3,10 +3,22 @@ from players.views import (
     AdminPlayerListCreateView,
     AdminPlayerDetailView,
     AdminPlayerUploadPhotoView,
+    AdminPlayerPhotoBatchUploadView,
+    AdminPlayerImportView,
+    AdminPlayerBulkUpdateView,
+    AdminPlayerExportView,
+    AdminMatchSheetView,
+    AdminWeaknessTagsView,
 )
 
 urlpatterns = [
     path("players/", AdminPlayerListCreateView.as_view(), name="admin-player-list"),
+    path("players/weakness-tags/", AdminWeaknessTagsView.as_view(), name="admin-player-weakness-tags"),
+    path("players/export/", AdminPlayerExportView.as_view(), name="admin-player-export"),
+    path("players/bulk-update/", AdminPlayerBulkUpdateView.as_view(), name="admin-player-bulk-update"),
+    path("players/upload-photos/", AdminPlayerPhotoBatchUploadView.as_view(), name="admin-player-upload-batch"),
+    path("players/import/", AdminPlayerImportView.as_view(), name="admin-player-import"),
     path("players/<int:pk>/", AdminPlayerDetailView.as_view(), name="admin-player-detail"),
     path("players/<int:pk>/upload-photo/", AdminPlayerUploadPhotoView.as_view(), name="admin-player-upload"),
+    path("events/<int:pk>/match-sheet/", AdminMatchSheetView.as_view(), name="admin-match-sheet"),
 ]
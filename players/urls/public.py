@@ -1,7 +1,8 @@
 from django.urls import path
-from players.views import PlayerOfTheMonthView, FeaturedPlayersView
+from players.views import PlayerOfTheMonthView, FeaturedPlayersView, LeaderboardView
 
 urlpatterns = [
     path("player-of-the-month/", PlayerOfTheMonthView.as_view(), name="player-of-the-month"),
     path("featured-players/", FeaturedPlayersView.as_view(), name="featured-players"),
+    path("leaderboard/", LeaderboardView.as_view(), name="leaderboard"),
 ]
@@ -1,108 +1,317 @@
 from rest_framework import generics, status, filters
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 
-from utils.cache import cached_view, cache_key, invalidate, CACHE_TTL
+from schedule.models import Event
+
+from utils.cache import cached_view, cache_key, invalidate_tags, query_key, versioned_key, CACHE_TTL
+from utils.conditional import ConditionalGetMixin, AdminConditionalGetMixin
+from utils.export import ExportMixin
+from utils.fieldsets import SparseFieldsetViewMixin
+from utils.pagination import KeysetCursorPagination
 from utils.permissions import IsAdminUser
-from utils.cloudinary_service import upload_image, delete_image
-from .models import Player
+from uploads.assets import release_image, store_image, store_images
+from uploads.jobs import enqueue_upload, wants_async
+from uploads.serializers import UploadJobSerializer
+from uploads.views import accepted
+from .filters import PlayerFilter, PlayerSearchFilter, weakness_tags
+from .importers import ImportFormatError, import_players
+from .match_stats import save_match_sheet
+from .models import LEADERBOARD_STATS, Player
 from .serializers import (
     PlayerPublicSerializer,
+    PlayerLeaderboardSerializer,
     PlayerAdminSerializer,
+    PlayerBulkUpdateSerializer,
+    PlayerPhotoBatchSerializer,
     PlayerListSerializer,
+    PlayerMatchStatSerializer,
+    MatchSheetSerializer,
 )
 
 
 # ═══════════════════ PUBLIC VIEWS ═══════════════════
 
 
-class PlayerOfTheMonthView(APIView):
+class PlayerOfTheMonthView(ConditionalGetMixin, APIView):
     permission_classes = [AllowAny]
+    watermark_tags = ["players"]
+    sparse_fieldsets = True     # ?fields= / ?omit= are part of the cache key
+
+    def get_queryset(self):
+        return Player.objects.filter(is_player_of_the_month=True)
 
     @cached_view(
-        key_func=lambda self, req: cache_key("player_of_the_month"),
+        key_func=query_key("player_of_the_month"),
         timeout=CACHE_TTL["long"],
+        tags=["players"],
+        stale_ttl=CACHE_TTL["medium"],
     )
     def get(self, request):
-        player = Player.objects.filter(is_player_of_the_month=True).first()
+        player = self.get_queryset().first()
         if not player:
             return Response(
                 {"error": "No Player of the Month found"},
                 status=status.HTTP_404_NOT_FOUND,
             )
-        return Response(PlayerPublicSerializer(player).data)
+        return Response(PlayerPublicSerializer(player, context={"request": request}).data)
 
 
-class FeaturedPlayersView(APIView):
+class FeaturedPlayersView(ConditionalGetMixin, APIView):
     permission_classes = [AllowAny]
+    watermark_tags = ["players"]
+    sparse_fieldsets = True
+
+    def get_queryset(self):
+        return Player.objects.filter(is_player_of_the_month=False, admission_status="admitted")
 
     @cached_view(
-        key_func=lambda self, req: cache_key("featured_players"),
+        key_func=query_key("featured_players"),
         timeout=CACHE_TTL["long"],
+        tags=["players"],
+        stale_ttl=CACHE_TTL["medium"],
     )
     def get(self, request):
-        players = Player.objects.filter(
-            is_player_of_the_month=False, admission_status="admitted"
-        )[:3]
-        return Response(PlayerPublicSerializer(players, many=True).data)
+        players = self.get_queryset()[:3]
+        return Response(PlayerPublicSerializer(players, many=True, context={"request": request}).data)
+
+
+def leaderboard_key(view, request):
+    # Unknown stats, positions and teams are answered uncached, so arbitrary
+    # values cannot fan the cache out
+    stat, position, team, limit = view.get_params(request)
+    position, team = position.lower(), team.lower()
+    options = leaderboard_options()
+    if stat not in LEADERBOARD_STATS or (position and position not in options["position"]) or (
+        team and team not in options["team"]
+    ):
+        return None
+    return cache_key("leaderboard", stat, limit, position, team)
+
+
+def leaderboard_options():
+    """
+    {"position": {...}, "team": {...}}: lowercased values present among
+    admitted players, cached until the leaderboard tag moves (any change to
+    position, team or admission bumps it).
+    """
+    key = versioned_key(cache_key("leaderboard_options"), ["leaderboard"])
+    options = cache.get(key)
+    if options is None:
+        rows = (
+            Player.objects.filter(admission_status="admitted")
+            .order_by()
+            .values_list("soccer_position", "team")
+            .distinct()
+        )
+        options = {"position": set(), "team": set()}
+        for position, team in rows:
+            options["position"].add(position.lower())
+            options["team"].add(team.lower())
+        cache.set(key, options, timeout=CACHE_TTL["day"])
+    return options
+
+
+class LeaderboardView(APIView):
+    """
+    GET /api/players/leaderboard/?stat=goals&position=&team=&limit=10
+    Top admitted players for one stat (players without a value are left
+    out). Ties share a rank. Served from cache until a ranked or displayed
+    player field changes (see players.signals).
+    """
+    permission_classes = [AllowAny]
+    default_limit = 10
+    max_limit = 50
+
+    def get_params(self, request):
+        params = request.query_params
+        try:
+            limit = min(max(int(params.get("limit", self.default_limit)), 1), self.max_limit)
+        except ValueError:
+            limit = self.default_limit
+        return (
+            params.get("stat", "goals"),
+            params.get("position", "").strip(),
+            params.get("team", "").strip(),
+            limit,
+        )
+
+    @cached_view(
+        key_func=leaderboard_key,
+        timeout=CACHE_TTL["day"],
+        tags=["leaderboard"],
+        prerender=True,
+    )
+    def get(self, request):
+        stat, position, team, limit = self.get_params(request)
+        if stat not in LEADERBOARD_STATS:
+            return Response(
+                {"error": f"stat must be one of: {', '.join(LEADERBOARD_STATS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        players = Player.objects.filter(admission_status="admitted", **{f"{stat}__isnull": False})
+        # Case-insensitive, like the cache key (exact match is case-sensitive
+        # on Postgres); the (admission_status, -stat) index still drives the scan
+        if position:
+            players = players.filter(soccer_position__iexact=position)
+        if team:
+            players = players.filter(team__iexact=team)
+        players = (
+            players.only("id", "surname", "other_name", "soccer_position", "team", "player_image")
+            .annotate(value=F(stat))
+            .order_by(f"-{stat}", "id")[:limit]
+        )
+
+        results = PlayerLeaderboardSerializer(players, many=True).data
+        # Standard competition ranking: 1, 2, 2, 4
+        for index, row in enumerate(results):
+            if index and row["value"] == results[index - 1]["value"]:
+                row["rank"] = results[index - 1]["rank"]
+            else:
+                row["rank"] = index + 1
+        return Response({"stat": stat, "results": results})
 
 
 # ═══════════════════ ADMIN VIEWS ═══════════════════
 
 
-class AdminPlayerListCreateView(generics.ListCreateAPIView):
+class AdminPlayerListCreateView(SparseFieldsetViewMixin, AdminConditionalGetMixin, generics.ListCreateAPIView):
     permission_classes = [IsAdminUser]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    watermark_tags = ["players"]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, PlayerSearchFilter]
     search_fields = ["surname", "other_name", "middle_name", "parent_guardian_name"]
-    filterset_fields = ["soccer_position", "admission_status", "team"]
+    filterset_class = PlayerFilter
     ordering_fields = ["surname", "created_at", "soccer_position"]
     ordering = ["-created_at"]
 
+    @property
+    def pagination_class(self):
+        # ?pagination=cursor (or a cursor from a previous page) switches to
+        # keyset paging on idx_player_created: constant cost at any depth.
+        params = self.request.query_params
+        if "cursor" in params or params.get("pagination") == "cursor":
+            return KeysetCursorPagination
+        return api_settings.DEFAULT_PAGINATION_CLASS
+
     def get_serializer_class(self):
         if self.request.method == "POST":
             return PlayerAdminSerializer
         return PlayerListSerializer
 
     def get_queryset(self):
-        return Player.objects.all()
-
-    def perform_create(self, serializer):
-        serializer.save()
-        invalidate(
-            cache_key("player_of_the_month"),
-            cache_key("featured_players"),
-            cache_key("dashboard_stats"),
-            cache_key("recent_players"),
-            cache_key("position_breakdown"),
-        )
+        return Player.objects.with_age_group()
+
 
+class AdminPlayerExportView(ExportMixin, AdminPlayerListCreateView):
+    """
+    GET /api/admin/players/export/?type=csv|xlsx
+    The player register as a file, with the same filters as the list.
+    """
+    http_method_names = ["get", "head", "options"]
+    export_filename = "players"
+    export_columns = [
+        ("ID", "id"),
+        ("Surname", "surname"),
+        ("Other Name", "other_name"),
+        ("Middle Name", "middle_name"),
+        ("Gender", "gender"),
+        ("Date of Birth", "date_of_birth"),
+        ("Age Group", "age_group"),
+        ("Position", "soccer_position"),
+        ("Team", "team"),
+        ("Admission Status", "admission_status"),
+        ("State of Origin", "state_of_origin"),
+        ("LGA", "lga"),
+        ("Telephone", "telephone"),
+        ("Parent / Guardian", "parent_guardian_name"),
+        ("Parent Telephone", "parent_telephone"),
+        ("Registered", "created_at"),
+    ]
 
-class AdminPlayerDetailView(generics.RetrieveUpdateDestroyAPIView):
+
+class AdminWeaknessTagsView(APIView):
+    """
+    GET /api/admin/players/weakness-tags/
+    Distinct weakness tags with player counts, for the coaching filter
+    dropdown (?weakness= on the player list).
+    """
     permission_classes = [IsAdminUser]
+
+    @cached_view(
+        key_func=lambda self, req: cache_key("weakness_tags"),
+        timeout=CACHE_TTL["long"],
+        tags=["players"],
+    )
+    def get(self, request):
+        return Response([{"tag": tag, "count": count} for tag, count in weakness_tags()])
+
+
+class AdminPlayerDetailView(SparseFieldsetViewMixin, AdminConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
+    permission_classes = [IsAdminUser]
+    watermark_tags = ["players"]
     serializer_class = PlayerAdminSerializer
     queryset = Player.objects.all()
 
-    def perform_update(self, serializer):
-        serializer.save()
-        invalidate(
-            cache_key("player_of_the_month"),
-            cache_key("featured_players"),
-            cache_key("dashboard_stats"),
-            cache_key("recent_players"),
-        )
+    # Cache invalidation and photo cleanup for saves and deletes live in
+    # players.signals
 
-    def perform_destroy(self, instance):
-        delete_image(instance.player_image_public_id)
-        instance.delete()
-        invalidate(
-            cache_key("player_of_the_month"),
-            cache_key("featured_players"),
-            cache_key("dashboard_stats"),
-            cache_key("recent_players"),
-            cache_key("position_breakdown"),
-        )
+
+class AdminPlayerBulkUpdateView(generics.GenericAPIView):
+    """
+    POST /api/admin/players/bulk-update/
+    Set admission_status and/or is_player_of_the_month on many players at
+    once: {"ids": [...], "admission_status": "admitted"}. Without "ids" the
+    list filters in the query string pick the rows (?admission_status=pending
+    &age_group=U13&search=...). Applied as UPDATE statements in one transaction —
+    no per-row save() or signals — and caches are invalidated once.
+    """
+    permission_classes = [IsAdminUser]
+    serializer_class = PlayerBulkUpdateSerializer
+    queryset = Player.objects.all()
+    filter_backends = AdminPlayerListCreateView.filter_backends
+    search_fields = AdminPlayerListCreateView.search_fields
+    filterset_class = AdminPlayerListCreateView.filterset_class
+    ids_chunk_size = 1000   # keeps IN (...) lists well under driver limits
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        ids = data.pop("ids", None)
+
+        if ids is None:
+            filter_params = set(self.filterset_class.base_filters) | {filters.SearchFilter.search_param}
+            if not filter_params & set(request.query_params):
+                return Response(
+                    {"error": "Provide ids or at least one filter"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        # update() bypasses auto_now, so stamp updated_at for the watermarks
+        data["updated_at"] = timezone.now()
+        with transaction.atomic():
+            if ids is None:
+                # Materialized first: MySQL rejects an UPDATE whose subquery
+                # reads the table being updated (error 1093)
+                ids = self.filter_queryset(self.get_queryset()).order_by().values_list("pk", flat=True)
+            ids = sorted(set(ids))
+            updated = sum(
+                Player.objects.filter(pk__in=ids[i:i + self.ids_chunk_size]).update(**data)
+                for i in range(0, len(ids), self.ids_chunk_size)
+            )
+            if updated:
+                tags = ["players", "leaderboard"] if "admission_status" in data else ["players"]
+                invalidate_tags(*tags)
+
+        return Response({"updated": updated})
 
 
 class AdminPlayerUploadPhotoView(APIView):
@@ -118,18 +327,135 @@ class AdminPlayerUploadPhotoView(APIView):
         if not file:
             return Response({"error": "No file provided"}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Delete old image
-        delete_image(player.player_image_public_id)
+        if wants_async(request):
+            # The old image is removed by the job once the new one is live
+            return accepted(enqueue_upload(file, "befa/players", "player", player.pk, request.user))
 
-        result = upload_image(file, folder="befa/players")
-        player.player_image = result["url"]
-        player.player_image_public_id = result["public_id"]
-        player.save()
-
-        invalidate(cache_key("player_of_the_month"), cache_key("featured_players"))
+        result = store_image(file, folder="befa/players")
+        with transaction.atomic():
+            release_image(player.player_image_public_id)
+            player.player_image = result["url"]
+            player.player_image_public_id = result["public_id"]
+            player.save()
 
         return Response({
             "url": result["url"],
             "public_id": result["public_id"],
             "player": PlayerAdminSerializer(player).data,
         })
+
+
+class AdminPlayerPhotoBatchUploadView(APIView):
+    """
+    POST /api/admin/players/upload-photos/
+    A whole squad's photos in one multipart request: repeated "player_ids"
+    and "files" fields, paired by position. Files are uploaded concurrently;
+    each player whose upload succeeded gets the new photo. Returns the
+    updated players and a per-player error list.
+
+    With ?async=1 (or UPLOAD_ASYNC) each file becomes a background upload
+    job instead and the response is 202 with the jobs to poll — use it for
+    large squads, which can outlast the worker timeout when run inline.
+    """
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        serializer = PlayerPhotoBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids, files = serializer.validated_data["player_ids"], serializer.validated_data["files"]
+
+        found = set(Player.objects.filter(pk__in=ids).values_list("pk", flat=True))
+        missing = [pk for pk in ids if pk not in found]
+        if missing:
+            return Response(
+                {"error": f"Players not found: {', '.join(map(str, missing))}"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        if wants_async(request):
+            with transaction.atomic():
+                jobs = [
+                    enqueue_upload(file, "befa/players", "player", pk, request.user)
+                    for pk, file in zip(ids, files)
+                ]
+            return Response(
+                {"jobs": UploadJobSerializer(jobs, many=True).data}, status=status.HTTP_202_ACCEPTED
+            )
+
+        uploaded, errors = [], []
+        results = store_images(files, folder="befa/players")
+        with transaction.atomic():
+            # Re-read under lock: the uploads took a while and only the photo
+            # fields are ours to write
+            players = Player.objects.select_for_update().in_bulk(ids)
+            for pk, result in zip(ids, results):
+                if isinstance(result, Exception):
+                    errors.append({"player": pk, "error": str(result)})
+                    continue
+                player = players.get(pk)
+                if player is None:
+                    release_image(result["public_id"])
+                    errors.append({"player": pk, "error": "Player not found"})
+                    continue
+                release_image(player.player_image_public_id)
+                player.player_image = result["url"]
+                player.player_image_public_id = result["public_id"]
+                player.save(update_fields=["player_image", "player_image_public_id", "updated_at"])
+                uploaded.append({"player": pk, "url": result["url"], "public_id": result["public_id"]})
+
+        return Response(
+            {"uploaded": uploaded, "errors": errors},
+            status=status.HTTP_201_CREATED if uploaded else status.HTTP_200_OK,
+        )
+
+
+class AdminPlayerImportView(APIView):
+    """
+    POST /api/admin/players/import/
+    Bulk-import registrations from a .csv or .xlsx file ("file" field; header
+    row = Player field names). Pass dry_run=true to validate without saving.
+    Returns counts and a per-row error report.
+    """
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        file = request.FILES.get("file")
+        if not file:
+            return Response({"error": "No file provided"}, status=status.HTTP_400_BAD_REQUEST)
+
+        dry_run = str(request.data.get("dry_run", "")).lower() in ("1", "true", "yes")
+        try:
+            report = import_players(file, file.name, dry_run=dry_run)
+        except ImportFormatError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        report["dry_run"] = dry_run
+        return Response(report, status=status.HTTP_201_CREATED if report["created"] else status.HTTP_200_OK)
+
+
+class AdminMatchSheetView(APIView):
+    """
+    GET/PUT /api/admin/events/<pk>/match-sheet/
+    PUT replaces the sheet of a match event:
+    {"players": [{"player": 12, "goals": 2, "assists": 0, "saves": null, "clean_sheet": false}, ...]}
+    Player season totals move by the difference in the same transaction.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get_event(self, pk):
+        return Event.objects.filter(pk=pk, event_type="match").first()
+
+    def get(self, request, pk):
+        event = self.get_event(pk)
+        if event is None:
+            return Response({"error": "Match not found"}, status=status.HTTP_404_NOT_FOUND)
+        stats = event.player_stats.select_related("player").order_by("player__surname")
+        return Response(PlayerMatchStatSerializer(stats, many=True).data)
+
+    def put(self, request, pk):
+        event = self.get_event(pk)
+        if event is None:
+            return Response({"error": "Match not found"}, status=status.HTTP_404_NOT_FOUND)
+        serializer = MatchSheetSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(save_match_sheet(event, serializer.validated_data["players"]))
@@ -1,14 +1,16 @@
 from rest_framework import serializers
+
+from utils.fieldsets import SparseFieldsetMixin
 from .models import Event
 
 
-class EventPublicSerializer(serializers.ModelSerializer):
+class EventPublicSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Event
         fields = ["id", "title", "event_type", "date", "time", "venue", "jersey_color", "created_at"]
 
 
-class EventAdminSerializer(serializers.ModelSerializer):
+class EventAdminSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Event
         fields = "__all__"
@@ -1,8 +1,10 @@
 from rest_framework import generics
 from rest_framework.permissions import AllowAny
-from rest_framework.response import Response
 
-from utils.cache import cached_view, cache_key, invalidate, CACHE_TTL
+from utils.cache import cached_view, query_key, invalidate_tags, CACHE_TTL
+from utils.conditional import ConditionalGetMixin, AdminConditionalGetMixin
+from utils.fieldsets import SparseFieldsetViewMixin
+from utils.pagination import OptionalPageNumberPagination
 from utils.permissions import IsAdminUser
 from .models import Event
 from .serializers import EventPublicSerializer, EventAdminSerializer
@@ -11,45 +13,51 @@ from .serializers import EventPublicSerializer, EventAdminSerializer
 # ═══════════════════ PUBLIC ═══════════════════
 
 
-class EventListView(generics.ListAPIView):
+class EventListView(SparseFieldsetViewMixin, ConditionalGetMixin, generics.ListAPIView):
     serializer_class = EventPublicSerializer
     permission_classes = [AllowAny]
+    watermark_tags = ["events"]
+    pagination_class = OptionalPageNumberPagination
+    filterset_fields = ["event_type", "date"]
+    ordering_fields = ["date", "time"]
 
     def get_queryset(self):
         return Event.objects.order_by("date", "time")
 
     @cached_view(
-        key_func=lambda self, req: cache_key("event_list"),
+        key_func=query_key("event_list"),
         timeout=CACHE_TTL["medium"],
+        tags=["events"],
+        prerender=True,
     )
     def get(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return self.list(request, *args, **kwargs)
 
 
 # ═══════════════════ ADMIN ═══════════════════
 
 
-class AdminEventListCreateView(generics.ListCreateAPIView):
+class AdminEventListCreateView(SparseFieldsetViewMixin, AdminConditionalGetMixin, generics.ListCreateAPIView):
     permission_classes = [IsAdminUser]
+    watermark_tags = ["events"]
     serializer_class = EventAdminSerializer
     queryset = Event.objects.all()
 
     def perform_create(self, serializer):
         serializer.save()
-        invalidate(cache_key("event_list"), cache_key("dashboard_stats"))
+        invalidate_tags("events")
 
 
-class AdminEventDetailView(generics.RetrieveUpdateDestroyAPIView):
+class AdminEventDetailView(SparseFieldsetViewMixin, AdminConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAdminUser]
+    watermark_tags = ["events"]
     serializer_class = EventAdminSerializer
     queryset = Event.objects.all()
 
     def perform_update(self, serializer):
         serializer.save()
-        invalidate(cache_key("event_list"))
+        invalidate_tags("events")
 
     def perform_destroy(self, instance):
         instance.delete()
-        invalidate(cache_key("event_list"), cache_key("dashboard_stats"))
+        invalidate_tags("events")
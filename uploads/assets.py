@@ -0,0 +1,123 @@
+"""
+Content-addressed image storage on top of Cloudinary.
+
+store_image() hashes the upload (streaming SHA-256, chunk by chunk) and
+reuses the existing Asset when the same bytes were uploaded before —
+no remote upload at all — otherwise uploads and records it. Each use
+holds one reference; release_image() drops it and queues the remote
+delete (uploads.outbox) only when nobody uses the image any more.
+Images that predate the asset table have no row and are deleted directly.
+"""
+import hashlib
+import logging
+from functools import partial
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from utils import cloudinary_service
+from .models import Asset
+from .outbox import schedule_delete
+
+logger = logging.getLogger("befa.uploads")
+
+CHUNK_SIZE = 64 * 1024
+
+
+def content_hash(file):
+    """(hex SHA-256, size) of a file-like object, leaving it rewound."""
+    digest, size = hashlib.sha256(), 0
+    file.seek(0)
+    chunks = file.chunks(CHUNK_SIZE) if hasattr(file, "chunks") else iter(partial(file.read, CHUNK_SIZE), b"")
+    for chunk in chunks:
+        digest.update(chunk)
+        size += len(chunk)
+    file.seek(0)
+    return digest.hexdigest(), size
+
+
+def _reuse(sha256):
+    """Take a reference on an existing asset; None if there is none."""
+    with transaction.atomic():
+        asset = Asset.objects.select_for_update().filter(sha256=sha256).first()
+        if asset is None:
+            return None
+        Asset.objects.filter(pk=asset.pk).update(ref_count=F("ref_count") + 1)
+    return {"url": asset.url, "public_id": asset.public_id}
+
+
+def store_image(file, folder="befa"):
+    """
+    upload_image() with de-duplication: same result shape
+    ({"url", "public_id"}), plus one reference on the asset. Identical
+    content keeps the folder of its first upload.
+    """
+    sha256, size = content_hash(file)
+    result = _reuse(sha256)
+    if result is not None:
+        logger.info("Reused asset %s for %d identical bytes", result["public_id"], size)
+        return result
+
+    return _record(sha256, size, cloudinary_service.upload_image(file, folder=folder))
+
+
+def store_images(files, folder="befa"):
+    """
+    store_image() for many files: content already stored is reused, the
+    rest is uploaded concurrently (each distinct file once). Returns one
+    entry per file, in order: the result dict or the exception raised.
+    """
+    results = [None] * len(files)
+    pending, sizes = {}, {}     # sha256 -> indexes of files with that content
+    for index, file in enumerate(files):
+        sha256, size = content_hash(file)
+        reused = None if sha256 in pending else _reuse(sha256)
+        if reused is not None:
+            results[index] = reused
+        else:
+            pending.setdefault(sha256, []).append(index)
+            sizes[sha256] = size
+
+    uploaded = cloudinary_service.upload_images(
+        [files[indexes[0]] for indexes in pending.values()], folder=folder
+    )
+    for (sha256, indexes), outcome in zip(pending.items(), uploaded):
+        if isinstance(outcome, Exception):
+            for index in indexes:
+                results[index] = outcome
+            continue
+        results[indexes[0]] = _record(sha256, sizes[sha256], outcome)
+        for index in indexes[1:]:
+            results[index] = _reuse(sha256)
+    return results
+
+
+def _record(sha256, size, result):
+    """Save a fresh upload as an asset; returns the result to hand out."""
+    try:
+        with transaction.atomic():
+            Asset.objects.create(sha256=sha256, public_id=result["public_id"], url=result["url"], size=size)
+        return result
+    except IntegrityError:
+        # The same bytes were uploaded concurrently: keep theirs, drop ours
+        reused = _reuse(sha256)
+        if reused is None:
+            raise
+        schedule_delete(result["public_id"])
+        return reused
+
+
+def release_image(*public_ids):
+    """Drop one reference per public_id; delete images nobody uses any more."""
+    orphaned = []
+    with transaction.atomic():
+        for public_id in filter(None, public_ids):
+            asset = Asset.objects.select_for_update().filter(public_id=public_id).first()
+            if asset is None:
+                orphaned.append(public_id)
+            elif asset.ref_count <= 1:
+                asset.delete()
+                orphaned.append(public_id)
+            else:
+                Asset.objects.filter(pk=asset.pk).update(ref_count=F("ref_count") - 1)
+        schedule_delete(*orphaned)
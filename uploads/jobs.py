@@ -0,0 +1,138 @@
+"""
+Background image uploads.
+
+enqueue_upload() stores the file in an UploadJob and, once the request's
+transaction commits, hands the job to a small per-process thread pool, so
+the web worker returns 202 immediately instead of waiting on Cloudinary.
+The pool runs run_job(): claim the job, upload, patch the target model,
+record the result. Jobs left behind by a restart are picked up by
+`manage.py process_upload_jobs`.
+
+    UPLOAD_ASYNC = False    # default for the upload endpoints (?async=1 per request)
+    UPLOAD_WORKERS = 2      # threads per process
+"""
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.apps import apps
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from utils.cache import invalidate_tags
+from .models import UploadJob
+from .assets import release_image, store_image
+
+logger = logging.getLogger("befa.uploads")
+
+# target -> (model, url field, public_id field, cache tag to bump or None)
+TARGETS = {
+    "player": ("players.Player", "player_image", "player_image_public_id", None),  # players.signals
+    "product": ("e_commerce.Product", "image_url", "image_public_id", "products"),
+    "post": ("content_hub.Post", "image_url", "image_public_id", "posts"),
+}
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, "UPLOAD_WORKERS", 2), thread_name_prefix="upload"
+        )
+    return _executor
+
+
+def wants_async(request):
+    """Per-request ?async= / form field, else the UPLOAD_ASYNC default."""
+    value = request.query_params.get("async", request.data.get("async"))
+    if value is None:
+        return getattr(settings, "UPLOAD_ASYNC", False)
+    return str(value).lower() in ("1", "true", "yes")
+
+
+def enqueue_upload(file, folder, target="", target_id=None, user=None):
+    job = UploadJob.objects.create(
+        folder=folder,
+        filename=getattr(file, "name", "") or "",
+        data=file.read(),
+        target=target,
+        target_id=target_id,
+        created_by=user if user and user.is_authenticated else None,
+    )
+    transaction.on_commit(partial(submit, job.pk))
+    return job
+
+
+def submit(job_id):
+    _get_executor().submit(_run_in_thread, job_id)
+
+
+def _run_in_thread(job_id):
+    close_old_connections()
+    try:
+        run_job(job_id)
+    except Exception:
+        logger.exception("Upload job %s crashed", job_id)
+    finally:
+        close_old_connections()
+
+
+def run_job(job_id):
+    """Run one queued job. Returns False if another worker already claimed it."""
+    claimed = UploadJob.objects.filter(pk=job_id, status="queued").update(
+        status="running", started_at=timezone.now(), attempts=F("attempts") + 1
+    )
+    if not claimed:
+        return False
+
+    job = UploadJob.objects.get(pk=job_id)
+    try:
+        file = io.BytesIO(bytes(job.data or b""))
+        file.name = job.filename
+        result = store_image(file, folder=job.folder)
+        job.url, job.public_id = result["url"], result["public_id"]
+        if job.target:
+            _patch_target(job)
+        job.status = "done"
+    except Exception as e:
+        logger.error("Upload job %s failed: %s", job_id, e)
+        job.status, job.error = "failed", str(e)[:2000]
+        if job.public_id:
+            # Stored but never attached: give back the reference (a retry
+            # takes a new one)
+            try:
+                release_image(job.public_id)
+            except Exception:
+                logger.exception("Could not release %s for job %s", job.public_id, job_id)
+            job.url, job.public_id = "", ""
+    job.data = None if job.status == "done" else job.data
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "url", "public_id", "error", "data", "finished_at"])
+    return True
+
+
+def _patch_target(job):
+    model_label, url_field, public_id_field, tag = TARGETS[job.target]
+    model = apps.get_model(model_label)
+    with transaction.atomic():
+        instance = model.objects.select_for_update().filter(pk=job.target_id).first()
+        if instance is None:
+            # Target deleted meanwhile; run_job releases the upload
+            raise LookupError(f"{job.target} {job.target_id} no longer exists")
+        release_image(getattr(instance, public_id_field))
+        setattr(instance, url_field, job.url)
+        setattr(instance, public_id_field, job.public_id)
+        instance.save()
+        if tag:
+            invalidate_tags(tag)
+
+
+def requeue_stale(older_than):
+    """Put jobs stuck in "running" (worker died mid-upload) back in the queue."""
+    cutoff = timezone.now() - older_than
+    return UploadJob.objects.filter(status="running", started_at__lt=cutoff).update(status="queued")
@@ -0,0 +1,25 @@
+"""
+Drain the Cloudinary deletion outbox.
+
+    python manage.py process_deletions           # everything due now
+    python manage.py process_deletions --all     # ignore backoff, retry every row
+"""
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from uploads.models import PendingDeletion
+from uploads.outbox import drain
+
+
+class Command(BaseCommand):
+    help = "Delete queued Cloudinary assets in batches of up to 100."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Retry rows still backing off as well.")
+
+    def handle(self, *args, **options):
+        if options["all"]:
+            PendingDeletion.objects.update(next_attempt_at=timezone.now())
+        handled = drain()
+        remaining = PendingDeletion.objects.count()
+        self.stdout.write(self.style.SUCCESS(f"Handled {handled} assets, {remaining} still pending"))
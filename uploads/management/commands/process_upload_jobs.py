@@ -0,0 +1,50 @@
+"""
+Run queued background uploads in this process.
+
+    python manage.py process_upload_jobs              # drain the queue once
+    python manage.py process_upload_jobs --loop       # keep polling
+    python manage.py process_upload_jobs --retry-failed
+
+Jobs normally run in the web process's pool right after the request; this
+picks up whatever a restart or crash left behind.
+"""
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from uploads.jobs import requeue_stale, run_job
+from uploads.models import UploadJob
+
+
+class Command(BaseCommand):
+    help = "Run queued image upload jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep polling for new jobs.")
+        parser.add_argument("--interval", type=float, default=5, help="Seconds between polls with --loop.")
+        parser.add_argument(
+            "--stale-after", type=int, default=600,
+            help="Requeue jobs running for longer than this many seconds.",
+        )
+        parser.add_argument("--retry-failed", action="store_true", help="Requeue failed jobs first.")
+
+    def handle(self, *args, **options):
+        if options["retry_failed"]:
+            count = UploadJob.objects.filter(status="failed").exclude(data=None).update(status="queued", error="")
+            self.stdout.write(f"Requeued {count} failed jobs")
+
+        while True:
+            requeue_stale(timedelta(seconds=options["stale_after"]))
+            ran = 0
+            queued = UploadJob.objects.filter(status="queued").order_by("created_at").values_list("pk", flat=True)
+            for job_id in list(queued[:100]):
+                if run_job(job_id):
+                    ran += 1
+                    job = UploadJob.objects.only("status", "error").get(pk=job_id)
+                    self.stdout.write(f"{job_id} {job.status} {job.error}".rstrip())
+            if not options["loop"]:
+                self.stdout.write(self.style.SUCCESS(f"Processed {ran} jobs"))
+                return
+            if not ran:
+                time.sleep(options["interval"])
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.3 on 2026-10-18 09:41
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=10)),
+                ('folder', models.CharField(default='befa/uploads', max_length=100)),
+                ('filename', models.CharField(blank=True, default='', max_length=255)),
+                ('data', models.BinaryField(blank=True, null=True)),
+                ('target', models.CharField(blank=True, default='', max_length=20)),
+                ('target_id', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('url', models.URLField(blank=True, default='', max_length=500)),
+                ('public_id', models.CharField(blank=True, default='', max_length=200)),
+                ('error', models.TextField(blank=True, default='')),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='idx_upload_job_status')],
+            },
+        ),
+    ]
@@ -0,0 +1,92 @@
+import uuid
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class UploadJob(models.Model):
+    """
+    An image upload handed off to the background pool (uploads.jobs).
+    The file is staged in the row itself so any worker process — or the
+    process_upload_jobs command on another machine — can pick it up; the
+    bytes are dropped once the job finishes.
+    """
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="queued")
+    folder = models.CharField(max_length=100, default="befa/uploads")
+    filename = models.CharField(max_length=255, blank=True, default="")
+    data = models.BinaryField(blank=True, null=True)
+
+    # Model to patch with the result (see uploads.jobs.TARGETS); blank = none
+    target = models.CharField(max_length=20, blank=True, default="")
+    target_id = models.PositiveBigIntegerField(blank=True, null=True)
+
+    url = models.URLField(max_length=500, blank=True, default="")
+    public_id = models.CharField(max_length=200, blank=True, default="")
+    error = models.TextField(blank=True, default="")
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, blank=True, null=True, related_name="+"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="idx_upload_job_status"),
+        ]
+
+    def __str__(self):
+        return f"Upload {self.id} ({self.status})"
+
+
+class PendingDeletion(models.Model):
+    """
+    Outbox of Cloudinary assets to delete (uploads.outbox). Rows are written
+    in the same transaction as the change that orphaned the asset and
+    removed once Cloudinary confirms; public_id is unique, so an asset
+    queued twice is still deleted once.
+    """
+    public_id = models.CharField(max_length=200, unique=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["next_attempt_at"], name="idx_pending_deletion_due"),
+        ]
+
+    def __str__(self):
+        return self.public_id
+
+
+class Asset(models.Model):
+    """
+    An image stored on Cloudinary, keyed by the SHA-256 of the uploaded
+    bytes (uploads.assets). Identical uploads share one asset; ref_count
+    is the number of places using it, and the remote image is only
+    deleted when it drops to zero.
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    public_id = models.CharField(max_length=200, unique=True)
+    url = models.URLField(max_length=500)
+    size = models.PositiveBigIntegerField(default=0)   # bytes as uploaded
+    ref_count = models.PositiveIntegerField(default=1)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.public_id} ({self.ref_count} refs)"
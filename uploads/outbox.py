@@ -0,0 +1,133 @@
+"""
+Deletion outbox for Cloudinary assets.
+
+schedule_delete() records public_ids in PendingDeletion inside the
+caller's transaction, so an asset is queued exactly when the change that
+orphaned it commits (and not at all if it rolls back). After commit a
+drain runs on the background upload pool and removes up to 100 assets per
+Admin API call; failures back off exponentially and are retried by the
+next drain or `manage.py process_deletions`.
+"""
+import logging
+import threading
+from datetime import timedelta
+
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from utils import cloudinary_service
+from .models import PendingDeletion
+
+logger = logging.getLogger("befa.uploads")
+
+BATCH_SIZE = 100            # Cloudinary's delete_resources limit
+BACKOFF_BASE = 30           # seconds; doubles per failed attempt
+BACKOFF_MAX = 6 * 60 * 60
+LEASE = timedelta(minutes=10)   # > the client's worst-case timeouts and retries
+DONE_STATUSES = {"deleted", "not_found"}
+
+# One drain per process at a time; kicks that arrive meanwhile re-run it
+_drain_requested = threading.Event()
+_drain_lock = threading.Lock()
+
+
+def schedule_delete(*public_ids):
+    public_ids = {public_id for public_id in public_ids if public_id}
+    if not public_ids:
+        return
+    PendingDeletion.objects.bulk_create(
+        [PendingDeletion(public_id=public_id) for public_id in public_ids],
+        ignore_conflicts=True,
+    )
+    transaction.on_commit(kick)
+
+
+def kick():
+    """Run a drain on the background pool, or have the running one go again."""
+    _drain_requested.set()
+    if _drain_lock.acquire(blocking=False):
+        from .jobs import _get_executor
+
+        _get_executor().submit(_drain_in_thread)
+
+
+def _drain_in_thread():
+    close_old_connections()
+    try:
+        while True:
+            try:
+                while _drain_requested.is_set():
+                    _drain_requested.clear()
+                    drain()
+            finally:
+                _drain_lock.release()
+            # A kick between the last check and the release found the lock
+            # taken; pick its request up here
+            if not (_drain_requested.is_set() and _drain_lock.acquire(blocking=False)):
+                return
+    except Exception:
+        logger.exception("Deletion outbox drain crashed")
+    finally:
+        close_old_connections()
+
+
+def _backoff(attempts):
+    return timedelta(seconds=min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX))
+
+
+def _claim(batch_size):
+    """
+    Lease a batch of due rows in a short transaction: pushing next_attempt_at
+    past LEASE hides them from other drains while the API call runs, without
+    holding row locks across it. A drain that dies mid-call just lets the
+    lease run out.
+    """
+    with transaction.atomic():
+        due = PendingDeletion.objects.filter(next_attempt_at__lte=timezone.now()).order_by("next_attempt_at")
+        if connection.features.has_select_for_update_skip_locked:
+            # Concurrent drains (several workers) take disjoint batches
+            due = due.select_for_update(skip_locked=True)
+        elif connection.features.has_select_for_update:
+            due = due.select_for_update()
+        rows = list(due[:batch_size])
+        if rows:
+            PendingDeletion.objects.filter(pk__in=[row.pk for row in rows]).update(
+                next_attempt_at=timezone.now() + LEASE
+            )
+    return rows
+
+
+def drain_batch(batch_size=BATCH_SIZE):
+    """Delete one batch of due assets. Returns how many rows were handled."""
+    rows = _claim(batch_size)
+    if not rows:
+        return 0
+
+    try:
+        statuses = cloudinary_service.delete_images(row.public_id for row in rows)
+        error = ""
+    except Exception as e:
+        statuses, error = {}, str(e)[:2000]
+        logger.warning("Cloudinary bulk delete failed (%d assets): %s", len(rows), e)
+
+    done = {row.pk for row in rows if statuses.get(row.public_id) in DONE_STATUSES}
+    now = timezone.now()
+    failed = [row for row in rows if row.pk not in done]
+    for row in failed:
+        row.attempts += 1
+        row.next_attempt_at = now + _backoff(row.attempts)
+        row.last_error = error or f"status: {statuses.get(row.public_id, 'missing')}"
+    with transaction.atomic():
+        PendingDeletion.objects.filter(pk__in=done).delete()
+        PendingDeletion.objects.bulk_update(failed, ["attempts", "next_attempt_at", "last_error"])
+    return len(rows)
+
+
+def drain(batch_size=BATCH_SIZE):
+    """Work through every due deletion. Returns the number of rows handled."""
+    handled = 0
+    while True:
+        count = drain_batch(batch_size)
+        handled += count
+        if count < batch_size:
+            return handled
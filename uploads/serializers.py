@@ -0,0 +1,12 @@
+from rest_framework import serializers
+
+from .models import UploadJob
+
+
+class UploadJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UploadJob
+        fields = [
+            "id", "status", "target", "target_id", "url", "public_id", "error",
+            "attempts", "created_at", "started_at", "finished_at",
+        ]
@@ -1,6 +1,7 @@
 from django.urls import path
-from .views import ImageUploadView
+from .views import ImageUploadView, UploadJobDetailView
 
 urlpatterns = [
     path("image/", ImageUploadView.as_view(), name="upload-image"),
+    path("jobs/<uuid:pk>/", UploadJobDetailView.as_view(), name="upload-job-detail"),
 ]
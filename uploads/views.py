@@ -1,15 +1,25 @@
+from django.shortcuts import get_object_or_404
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from utils.permissions import IsAdminUser
-from utils.cloudinary_service import upload_image
+from .assets import store_image
+from .jobs import enqueue_upload, wants_async
+from .models import UploadJob
+from .serializers import UploadJobSerializer
+
+
+def accepted(job):
+    """202 response for a queued upload; poll the job URL for the result."""
+    return Response(UploadJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
 
 
 class ImageUploadView(APIView):
     """
     POST /api/admin/uploads/image/
-    Generic image upload to Cloudinary. Returns URL and public_id.
+    Generic image upload to Cloudinary. Returns URL and public_id, or a
+    job (202) when run in the background (?async=1 or UPLOAD_ASYNC).
     """
     permission_classes = [IsAdminUser]
 
@@ -22,5 +32,19 @@ class ImageUploadView(APIView):
             )
 
         folder = request.data.get("folder", "befa/uploads")
-        result = upload_image(file, folder=folder)
+        if wants_async(request):
+            return accepted(enqueue_upload(file, folder, user=request.user))
+        result = store_image(file, folder=folder)
         return Response(result, status=status.HTTP_201_CREATED)
+
+
+class UploadJobDetailView(APIView):
+    """
+    GET /api/admin/uploads/jobs/<id>/
+    Status of a background upload: queued → running → done | failed.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, pk):
+        job = get_object_or_404(UploadJob.objects.defer("data"), pk=pk)
+        return Response(UploadJobSerializer(job).data)
@@ -1,15 +1,65 @@
 """
 Caching utilities with automatic key prefixing and cache invalidation.
 Implements the Caching system design principle.
+
+Invalidation is tag based: every cached view declares the data it depends
+on (e.g. "players", "products") and each tag has a version token stored in
+the cache. The current tokens are folded into the entry key, so bumping a
+tag's token makes every dependent entry unreachable in one write — no key
+lists to maintain, no SCAN / delete_pattern. Orphaned entries age out via
+their TTL.
+
+Expensive entries can opt into stale-while-revalidate (stale_ttl): the
+previous value keeps being served, across expiry and invalidation, while
+exactly one worker recomputes it.
+
+An optional per-process LRU (CACHE_LOCAL_MAX_ENTRIES) sits in front of the
+shared backend. Local entries are keyed by the versioned key, so the tag
+version read that every request already does is the cross-worker
+invalidation signal: once any worker bumps a tag, the others stop finding
+their local copies.
+
+With prerender=True the final JSON bytes are cached alongside a content
+hash: hits skip the renderer entirely, carry an ETag, and requests with a
+matching If-None-Match get 304 Not Modified.
+
+List endpoints key on a normalized query string (query_key) and can split
+per-viewer fields out of the shared body: the cached skeleton is the same
+for everyone and an overlay callable patches in the viewer's fields.
+
+Payloads are stored as compact codec bytes (utils.cache_codecs: JSON by
+default, zlib above a size threshold) rather than pickled structures; the
+local tier keeps the decoded form so local hits skip decoding too.
+
+Invalidations are deferred until the surrounding transaction commits and,
+within a request (CoalesceInvalidationsMiddleware), collected and sent
+once, de-duplicated, at the end.
 """
+import contextlib
+import copy
 import functools
 import hashlib
+import json
 import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
 
+from django.conf import settings
 from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags, urlencode
+
+from utils import cache_codecs
+from utils.cache_metrics import metrics
 
 logger = logging.getLogger("befa.cache")
 
+# Per-thread batch of pending invalidations (see coalesced_invalidations)
+_batches = threading.local()
+
 CACHE_TTL = {
     "short": 60,           # 1 min — volatile data
     "medium": 60 * 15,     # 15 min — default
@@ -17,63 +67,451 @@ CACHE_TTL = {
     "day": 60 * 60 * 24,   # 24 hours — rarely changes
 }
 
+# Single-flight recomputation
+LOCK_TIMEOUT = 10          # max seconds a fill may hold the lock
+LOCK_WAIT = 3              # max seconds a waiter polls before filling itself
+LOCK_POLL_INTERVAL = 0.05
+
+
+
+class LocalLRU:
+    """Size-bounded, thread-safe in-process LRU with per-entry expiry."""
+
+    def __init__(self, max_entries, timeout):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires = item
+            if expires <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout=None):
+        if not self.enabled:
+            return
+        timeout = self.timeout if timeout is None else min(timeout, self.timeout)
+        if timeout <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + timeout)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete_many(self, keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+local_cache = LocalLRU(
+    max_entries=getattr(settings, "CACHE_LOCAL_MAX_ENTRIES", 0),
+    timeout=getattr(settings, "CACHE_LOCAL_TIMEOUT", 30),
+)
+
 
 def cache_key(*parts):
     """Generate a namespaced cache key."""
     return "befa:" + ":".join(str(p) for p in parts)
 
 
-def cached_view(key_func, timeout=CACHE_TTL["medium"]):
+def _stale_key(key):
+    return f"{key}:stale"
+
+
+def _query_params(view):
+    """Query parameters that change the output of a list view."""
+    from django_filters.rest_framework import DjangoFilterBackend
+    from rest_framework.filters import OrderingFilter, SearchFilter
+
+    params = set()
+    for backend in getattr(view, "filter_backends", ()):
+        if issubclass(backend, SearchFilter) and getattr(view, "search_fields", None):
+            params.add(backend.search_param)
+        elif issubclass(backend, OrderingFilter):
+            params.add(backend.ordering_param)
+        elif issubclass(backend, DjangoFilterBackend):
+            filterset_class = backend().get_filterset_class(view, view.get_queryset())
+            if filterset_class is not None:
+                params.update(filterset_class.base_filters)
+    if getattr(view, "sparse_fieldsets", False):
+        from utils.fieldsets import FIELDS_PARAM, OMIT_PARAM
+
+        params.update((FIELDS_PARAM, OMIT_PARAM))
+    paginator = getattr(view, "paginator", None)
+    for attr in ("page_query_param", "page_size_query_param", "cursor_query_param"):
+        if getattr(paginator, attr, None):
+            params.add(getattr(paginator, attr))
+    return params
+
+
+def query_key(name):
+    """
+    key_func for list views: name plus the normalized query string.
+    Only parameters the view actually honours (filters, search, ordering,
+    pagination, sparse fieldsets) are kept, sorted and stripped of blanks,
+    so equivalent URLs share an entry and junk parameters cannot fan the
+    cache out.
+    """
+    known = {}
+
+    def key_func(view_instance, request):
+        view_class = type(view_instance)
+        if view_class not in known:
+            known[view_class] = _query_params(view_instance)
+        items = sorted(
+            (param, value)
+            for param in known[view_class]
+            for value in request.query_params.getlist(param)
+            if value != ""
+        )
+        if not items:
+            return cache_key(name)
+        query = urlencode(items)
+        if len(query) > 100:
+            query = hashlib.blake2b(query.encode(), digest_size=16).hexdigest()
+        return cache_key(name, query)
+
+    return key_func
+
+
+def _family(key):
+    """Metrics family of a key: befa:product_list:page=2 -> product_list."""
+    return key.removeprefix("befa:").split(":", 1)[0]
+
+
+def _tag_key(tag):
+    return cache_key("tag", tag)
+
+
+def _new_version():
+    return uuid.uuid4().hex[:12]
+
+
+def tag_versions(tags):
+    """
+    Return the current version token of each tag, in order.
+    Missing tokens (first use, eviction) are created with a fresh random
+    value, so an evicted tag can never resurrect entries from an old version.
+    """
+    keys = [_tag_key(tag) for tag in tags]
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        for key in missing:
+            cache.add(key, _new_version(), timeout=None)
+        found.update(cache.get_many(missing))
+    return [found.get(key, "0") for key in keys]
+
+
+def versioned_key(key, tags):
+    """Fold the current tag versions into key (one cache round trip)."""
+    if not tags:
+        return key
+    return f"{key}@{'.'.join(tag_versions(tags))}"
+
+
+def _render(data):
+    """Render data exactly as the default DRF renderer would."""
+    from rest_framework.settings import api_settings
+
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    body = renderer.render(data)
+    etag = '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+    return body, etag, renderer.media_type
+
+
+def _etag_matches(request, etag):
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in [tag.removeprefix("W/") for tag in parse_etags(header)]
+
+
+def _respond(request, entry, overlay=None):
+    """Build the response for a cache entry (data or pre-rendered bytes)."""
+    from rest_framework.response import Response
+
+    if overlay is not None and request.user.is_authenticated:
+        if "body" in entry:
+            data = json.loads(entry["body"])
+        else:
+            data = copy.deepcopy(entry["data"])
+        return Response(overlay(request, data))
+    if "body" not in entry:
+        return Response(entry["data"])
+    if _etag_matches(request, entry["etag"]):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(entry["body"], content_type=entry["content_type"])
+    response["ETag"] = entry["etag"]
+    return response
+
+
+def _pack(entry):
+    """Entry -> stored form, with the data/body encoded into one payload."""
+    stored = {k: v for k, v in entry.items() if k not in ("data", "body")}
+    if "body" in entry:
+        stored["payload"] = cache_codecs.dumps_bytes(entry["body"])
+    else:
+        stored["payload"] = cache_codecs.dumps(entry["data"])
+    return stored
+
+
+def _unpack(stored):
+    if stored is None or "payload" not in stored:
+        return stored
+    entry = {k: v for k, v in stored.items() if k != "payload"}
+    if "etag" in stored:
+        entry["body"] = cache_codecs.loads(stored["payload"])
+    else:
+        entry["data"] = cache_codecs.loads(stored["payload"])
+    return entry
+
+
+def _get_entry(key):
+    """Read an entry from the local tier, then the shared cache."""
+    entry = local_cache.get(key)
+    if entry is not None:
+        return entry
+    entry = _unpack(cache.get(key))
+    if entry is not None:
+        local_cache.set(key, entry, timeout=entry["fresh_until"] - time.time())
+    return entry
+
+
+def _acquire(lock, timeout):
+    return cache.add(lock, 1, timeout=timeout)
+
+
+def _wait_for(key, timeout):
+    """Poll for an entry another worker is filling; None if it never lands."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        entry = _get_entry(key)
+        if entry is not None:
+            return entry
+    return None
+
+
+def cached_view(
+    key_func,
+    timeout=CACHE_TTL["medium"],
+    tags=(),
+    stale_ttl=0,
+    lock_timeout=LOCK_TIMEOUT,
+    prerender=False,
+    overlay=None,
+):
     """
     Decorator for DRF views. Caches successful GET responses.
-    key_func: callable(view_instance, request) -> str
+    key_func: callable(view_instance, request) -> str, or None to serve
+        this request uncached (e.g. parameter values that match nothing).
+    tags: data the response depends on; invalidate_tags(tag) drops it.
+    stale_ttl: seconds the previous value may still be served (after expiry
+        or invalidation) while a single request recomputes it.
+    lock_timeout: upper bound on a recomputation holding the fill lock.
+    prerender: cache the rendered JSON bytes and serve them with an ETag
+        (304 on a matching If-None-Match) instead of re-rendering data.
+    overlay: callable(request, data) -> data adding per-viewer fields for
+        authenticated requests; the view itself must render the shared,
+        viewer-independent skeleton.
+
+    Recomputation is single-flight: only the worker holding the fill lock
+    runs the view; the others serve the stale value or wait for the fill.
+    Stale responses are marked with response.cache_stale = True.
     """
+    tags = tuple(sorted(set(tags)))
+
     def decorator(method):
+        def fill(view_instance, request, args, kwargs, base_key, key):
+            # The view's own exceptions (NotFound for ?page=999, ...) propagate
+            started = time.perf_counter()
+            response = method(view_instance, request, *args, **kwargs)
+            if response.status_code >= 400:
+                metrics.record(_family(base_key), misses=1)
+                return response
+            entry = {"fresh_until": time.time() + timeout}
+            if prerender:
+                entry["body"], entry["etag"], entry["content_type"] = _render(response.data)
+            else:
+                entry["data"] = response.data
+            try:
+                stored = _pack(entry)
+                metrics.record(
+                    _family(base_key),
+                    misses=1,
+                    fill_us=int((time.perf_counter() - started) * 1_000_000),
+                    bytes=len(stored["payload"]),
+                )
+                entries = {key: stored}
+                if stale_ttl:
+                    entries[_stale_key(base_key)] = stored
+                cache.set_many(entries, timeout=timeout + stale_ttl)
+                local_cache.set(key, entry, timeout=timeout)
+            except Exception:
+                logger.exception("Cache error, response not stored")
+                metrics.record(_family(base_key), errors=1)
+            if prerender or overlay is not None:
+                return _respond(request, entry, overlay)
+            return response
+
         @functools.wraps(method)
         def wrapper(view_instance, request, *args, **kwargs):
             if request.method != "GET":
                 return method(view_instance, request, *args, **kwargs)
+            # Only cache failures fall through to the view; the view itself
+            # runs outside the try so its exceptions surface unchanged
+            base_key, locked = None, False
             try:
-                key = key_func(view_instance, request)
-                cached_data = cache.get(key)
-                if cached_data is not None:
-                    logger.debug("Cache HIT: %s", key)
-                    from rest_framework.response import Response
-                    return Response(cached_data)
-                logger.debug("Cache MISS: %s", key)
-                response = method(view_instance, request, *args, **kwargs)
-                if response.status_code < 400:
-                    cache.set(key, response.data, timeout=timeout)
-                return response
+                base_key = key_func(view_instance, request)
+                if base_key is not None:
+                    key = versioned_key(base_key, tags)
+                    entry = _get_entry(key)
+                    if entry is not None and entry["fresh_until"] > time.time():
+                        logger.debug("Cache HIT: %s", key)
+                        metrics.record(_family(base_key), hits=1)
+                        return _respond(request, entry, overlay)
+                    if entry is None and stale_ttl:
+                        entry = _unpack(cache.get(_stale_key(base_key)))
+
+                    lock = f"{key}:lock"
+                    locked = _acquire(lock, lock_timeout)
+                    if not locked and entry is not None:
+                        logger.debug("Cache STALE: %s", key)
+                        metrics.record(_family(base_key), stale=1)
+                        response = _respond(request, entry, overlay)
+                        # Older than the current data: no watermark validators
+                        response.cache_stale = True
+                        return response
+                    if not locked:
+                        entry = _wait_for(key, min(lock_timeout, LOCK_WAIT))
+                        if entry is not None:
+                            logger.debug("Cache HIT (after wait): %s", key)
+                            metrics.record(_family(base_key), hits=1)
+                            return _respond(request, entry, overlay)
+                        logger.debug("Cache MISS (lock wait expired): %s", key)
+                    else:
+                        logger.debug("Cache MISS: %s", key)
             except Exception:
                 logger.exception("Cache error, falling through")
+                metrics.record(_family(base_key or "unknown"), errors=1)
                 return method(view_instance, request, *args, **kwargs)
+
+            if base_key is None:
+                return method(view_instance, request, *args, **kwargs)
+            try:
+                return fill(view_instance, request, args, kwargs, base_key, key)
+            finally:
+                if locked:
+                    with contextlib.suppress(Exception):
+                        cache.delete(lock)
+        wrapper.is_cached_view = True
         return wrapper
     return decorator
 
 
-def invalidate(*keys):
-    """Delete one or more cache keys."""
-    for key in keys:
-        cache.delete(key)
-        logger.debug("Cache INVALIDATED: %s", key)
+def cached_endpoints(patterns=None, prefix=""):
+    """
+    Yield (path, view_class) for every URL served by a cached_view-decorated
+    GET handler that takes no URL arguments (i.e. can be warmed blindly).
+    """
+    from django.urls import URLPattern, URLResolver, get_resolver
+
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            yield from cached_endpoints(pattern.url_patterns, route)
+        elif isinstance(pattern, URLPattern):
+            view_class = getattr(pattern.callback, "view_class", None)
+            handler = getattr(view_class, "get", None)
+            if getattr(handler, "is_cached_view", False) and not pattern.pattern.converters:
+                yield "/" + route, view_class
+
+
+def _flush(tags, keys):
+    """Send a batch of invalidations: one set_many plus one delete_many."""
+    try:
+        if tags:
+            cache.set_many({_tag_key(tag): _new_version() for tag in tags}, timeout=None)
+            logger.debug("Cache tags INVALIDATED: %s", ", ".join(sorted(tags)))
+        if keys:
+            cache.delete_many(list(keys))
+            local_cache.delete_many(keys)
+            logger.debug("Cache INVALIDATED: %s", ", ".join(sorted(keys)))
+    except Exception:
+        logger.exception("Cache invalidation failed")
+
+
+def _send(tags=(), keys=()):
+    """
+    Route invalidations: into the active batch if there is one, otherwise
+    after the current transaction commits (immediately in autocommit). Never
+    before commit, so a concurrent reader cannot re-cache pre-write rows
+    under the new version.
+    """
+    batch = getattr(_batches, "current", None)
+    if batch is not None:
+        batch["tags"].update(tags)
+        batch["keys"].update(keys)
+    else:
+        transaction.on_commit(functools.partial(_flush, set(tags), set(keys)))
 
 
-def invalidate_pattern(prefix):
+@contextlib.contextmanager
+def coalesced_invalidations():
     """
-    Invalidate all known keys starting with prefix.
-    Note: LocMemCache doesn't support pattern delete, so we track known keys.
-    For Redis in prod, use cache.delete_pattern().
+    Collect every invalidate()/invalidate_tags() call in the block and send
+    them de-duplicated, once, at the end (after commit if a transaction is
+    still open). Nested blocks join the outermost one.
     """
+    if getattr(_batches, "current", None) is not None:
+        yield
+        return
+    _batches.current = batch = {"tags": set(), "keys": set()}
     try:
-        if hasattr(cache, "delete_pattern"):
-            cache.delete_pattern(f"{prefix}*")
-        else:
-            # Fallback: delete known keys
-            known = cache.get("befa:known_keys", set())
-            to_delete = {k for k in known if k.startswith(prefix)}
-            for k in to_delete:
-                cache.delete(k)
-            cache.set("befa:known_keys", known - to_delete)
-    except Exception:
-        logger.exception("Pattern invalidation failed")
+        yield
+    finally:
+        _batches.current = None
+        if batch["tags"] or batch["keys"]:
+            transaction.on_commit(functools.partial(_flush, batch["tags"], batch["keys"]))
+
+
+def invalidate(*keys):
+    """Delete one or more cache keys (local tier: this process only)."""
+    if keys:
+        _send(keys=keys)
+
+
+def invalidate_tags(*tags):
+    """
+    Invalidate every entry cached under any of the given tags.
+    O(1): a single set_many of fresh version tokens, whatever the number
+    of dependent keys, on both Redis and LocMem.
+    """
+    if tags:
+        _send(tags=tags)
@@ -0,0 +1,121 @@
+"""
+Pluggable codecs for cached_view payloads.
+
+Payloads are stored as compact bytes: a two-byte header (codec id,
+compression flag) followed by the encoded value, zlib-compressed once it
+exceeds CACHE_COMPRESS_MIN_BYTES. The header makes every stored payload
+self-describing, so switching CACHE_CODEC never misreads older entries.
+
+    CACHE_CODEC = "json"     # default; "pickle", "msgpack" (optional dep)
+                             # or a dotted path to a Codec subclass
+"""
+import json
+import pickle
+import zlib
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+RAW = b"0"
+ZLIB = b"z"
+COMPRESS_LEVEL = 6
+
+
+class Codec:
+    """Base codec: value <-> bytes. Subclasses set a unique one-byte id."""
+    id = b""
+
+    def encode(self, value):
+        raise NotImplementedError
+
+    def decode(self, data):
+        raise NotImplementedError
+
+
+class JSONCodec(Codec):
+    """Compact JSON via DRF's encoder (response data is JSON-safe already)."""
+    id = b"j"
+
+    def encode(self, value):
+        from rest_framework.utils.encoders import JSONEncoder
+
+        return json.dumps(
+            value, cls=JSONEncoder, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+
+    def decode(self, data):
+        return json.loads(data)
+
+
+class PickleCodec(Codec):
+    id = b"p"
+
+    def encode(self, value):
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    def decode(self, data):
+        return pickle.loads(data)
+
+
+class MsgpackCodec(Codec):
+    """Requires the optional msgpack package."""
+    id = b"m"
+
+    def encode(self, value):
+        import msgpack
+
+        from rest_framework.utils.encoders import JSONEncoder
+
+        return msgpack.packb(value, default=JSONEncoder().default, use_bin_type=True)
+
+    def decode(self, data):
+        import msgpack
+
+        return msgpack.unpackb(data, raw=False)
+
+
+CODECS = {codec.id: codec for codec in (JSONCodec(), PickleCodec(), MsgpackCodec())}
+CODEC_NAMES = {"json": b"j", "pickle": b"p", "msgpack": b"m"}
+
+
+def _configured_codec():
+    name = getattr(settings, "CACHE_CODEC", "json")
+    if name in CODEC_NAMES:
+        return CODECS[CODEC_NAMES[name]]
+    try:
+        codec = import_string(name)()
+    except ImportError as e:
+        raise ImproperlyConfigured(f"Unknown CACHE_CODEC {name!r}") from e
+    CODECS.setdefault(codec.id, codec)
+    return codec
+
+
+codec = _configured_codec()
+compress_min_bytes = getattr(settings, "CACHE_COMPRESS_MIN_BYTES", 1024)
+
+
+def _frame(codec_id, data):
+    if len(data) >= compress_min_bytes:
+        return codec_id + ZLIB + zlib.compress(data, COMPRESS_LEVEL)
+    return codec_id + RAW + data
+
+
+def dumps(value):
+    """Encode value with the configured codec (+ zlib above the threshold)."""
+    return _frame(codec.id, codec.encode(value))
+
+
+def dumps_bytes(data):
+    """Frame already-encoded bytes (e.g. rendered JSON) without re-encoding."""
+    return _frame(b"b", data)
+
+
+def loads(payload):
+    """Decode a payload produced by dumps() or dumps_bytes()."""
+    codec_id, flag, data = payload[:1], payload[1:2], payload[2:]
+    if flag == ZLIB:
+        data = zlib.decompress(data)
+    if codec_id == b"b":
+        return data
+    return CODECS[codec_id].decode(data)
@@ -0,0 +1,101 @@
+"""
+Hit/miss/latency instrumentation for cached_view.
+
+Counters are aggregated per key family (the first part of the cache key,
+e.g. "product_list") in process memory and flushed to the shared cache
+with atomic incr every CACHE_METRICS_FLUSH_INTERVAL seconds, so the totals
+cover all workers without a cache write per request.
+"""
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger("befa.cache")
+
+FIELDS = ("hits", "stale", "misses", "errors", "fill_us", "bytes")
+FAMILIES_KEY = "befa:stats:families"
+
+
+def _counter_key(family, field):
+    return f"befa:stats:{family}:{field}"
+
+
+def _incr(key, delta):
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        # Missing key: create it, unless another worker just did
+        if not cache.add(key, delta, timeout=None):
+            cache.incr(key, delta)
+
+
+class CacheMetrics:
+    """In-process counters, periodically folded into the shared cache."""
+
+    def __init__(self, flush_interval):
+        self.flush_interval = flush_interval
+        self._counts = defaultdict(Counter)
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def record(self, family, **deltas):
+        with self._lock:
+            self._counts[family].update(deltas)
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            counts, self._counts = self._counts, defaultdict(Counter)
+            self._last_flush = time.monotonic()
+        if not counts:
+            return
+        try:
+            for family, counter in counts.items():
+                for field, value in counter.items():
+                    if value:
+                        _incr(_counter_key(family, field), int(value))
+            # The index is rewritten by whichever flush notices a gap, so a
+            # lost concurrent update is repaired on that worker's next flush.
+            known = cache.get(FAMILIES_KEY, set())
+            if not set(counts) <= known:
+                cache.set(FAMILIES_KEY, known | set(counts), timeout=None)
+        except Exception:
+            logger.exception("Cache metrics flush failed")
+
+    def snapshot(self):
+        """Totals per family across all workers (flushes this process first)."""
+        self.flush()
+        families = sorted(cache.get(FAMILIES_KEY, set()))
+        keys = [_counter_key(family, field) for family in families for field in FIELDS]
+        values = cache.get_many(keys)
+        result = {}
+        for family in families:
+            row = {field: values.get(_counter_key(family, field), 0) for field in FIELDS}
+            lookups = row["hits"] + row["stale"] + row["misses"]
+            result[family] = {
+                "hits": row["hits"],
+                "stale": row["stale"],
+                "misses": row["misses"],
+                "errors": row["errors"],
+                "hit_ratio": round((row["hits"] + row["stale"]) / lookups, 4) if lookups else None,
+                "avg_fill_ms": round(row["fill_us"] / row["misses"] / 1000, 2) if row["misses"] else None,
+                "avg_bytes": row["bytes"] // row["misses"] if row["misses"] else None,
+            }
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+        families = cache.get(FAMILIES_KEY, set())
+        cache.delete_many(
+            [_counter_key(family, field) for family in families for field in FIELDS] + [FAMILIES_KEY]
+        )
+
+
+metrics = CacheMetrics(flush_interval=getattr(settings, "CACHE_METRICS_FLUSH_INTERVAL", 30))
@@ -1,18 +1,198 @@
 """
 Cloudinary upload service.
 Implements Blob Storage + CDN pattern.
+
+With IMAGE_PREPROCESS on, images are validated, EXIF-stripped, downscaled
+to IMAGE_MAX_DIMENSION and re-encoded as webp locally — in a process pool,
+off the GIL — before upload, so a 6 MB phone photo leaves as a few hundred
+KB. Requires Pillow; without it uploads go out untouched.
+
+    IMAGE_PREPROCESS = False
+    IMAGE_MAX_DIMENSION = 2048      # px, longest side
+    IMAGE_WEBP_QUALITY = 82
+    IMAGE_PREPROCESS_WORKERS = 2    # processes per web worker
+
+Every call goes through one keep-alive connection pool per process with
+connect/read timeouts and jittered exponential retries on connection
+errors and rate-limit/unavailable answers. upload_images() uploads many files at once
+on a bounded thread pool.
+
+    CLOUDINARY_POOL_SIZE = 10           # kept-alive connections
+    CLOUDINARY_CONNECT_TIMEOUT = 5      # seconds
+    CLOUDINARY_READ_TIMEOUT = 60        # seconds
+    CLOUDINARY_RETRIES = 3
+    CLOUDINARY_BATCH_WORKERS = 4        # concurrent uploads per batch
+    CLOUDINARY_UPLOAD_PREFIX = ""       # API base URL, e.g. a local fake server
 """
+import io
 import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import cloudinary
+import cloudinary.api
+import cloudinary.api_client.call_api
 import cloudinary.uploader
+from cloudinary.utils import get_http_connector
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+from urllib3.util import Retry, Timeout
+
+from utils import imaging
 
 logger = logging.getLogger("befa.cloudinary")
 
+MAX_INPUT_BYTES = 30 * 1024 * 1024
+PREPROCESS_TIMEOUT = 30         # seconds
+# Answers that mean the request was not processed: rate limited or unavailable
+RETRY_STATUSES = (420, 429, 503)
+
+
+class InvalidImage(ValidationError):
+    """The upload is not an image we accept (400 through DRF)."""
+
+    def __str__(self):
+        return "; ".join(str(message) for message in self.detail)
+
+
+# ─── Pre-processing ─────────────────────────────────────────
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    # Created lazily, often from an upload thread: forkserver children are
+    # never forked from the multi-threaded web worker itself
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=getattr(settings, "IMAGE_PREPROCESS_WORKERS", 2),
+                mp_context=multiprocessing.get_context("forkserver"),
+            )
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        _pool = None
+
+
+def preprocess_image(file):
+    """
+    Return a file-like webp version of `file` (or `file` itself when
+    pre-processing is off, unavailable or pointless). Raises InvalidImage.
+    """
+    if not getattr(settings, "IMAGE_PREPROCESS", False):
+        return file
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        logger.warning("IMAGE_PREPROCESS is on but Pillow is not installed; uploading originals")
+        return file
+
+    data = file.read()
+    if len(data) > MAX_INPUT_BYTES:
+        raise InvalidImage(f"Image is larger than {MAX_INPUT_BYTES // (1024 * 1024)} MB")
+
+    started = time.perf_counter()
+    args = (
+        data,
+        getattr(settings, "IMAGE_MAX_DIMENSION", 2048),
+        getattr(settings, "IMAGE_WEBP_QUALITY", 82),
+    )
+    try:
+        processed, detail = _get_pool().submit(imaging.preprocess, *args).result(timeout=PREPROCESS_TIMEOUT)
+    except BrokenProcessPool:
+        _reset_pool()
+        processed, detail = imaging.preprocess(*args)
+    except TimeoutError:
+        raise InvalidImage(f"Image took longer than {PREPROCESS_TIMEOUT} s to process")
+    except ValueError as e:
+        raise InvalidImage(str(e))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    name = getattr(file, "name", "") or "upload"
+    if processed is None or len(processed) >= len(data):
+        processed = data    # already small (or animated): keep the original
+    else:
+        name = name.rsplit(".", 1)[0] + ".webp"
+
+    logger.info(
+        "Pre-processed %s: %d -> %d bytes (%s) in %.0f ms",
+        name, len(data), len(processed), detail, elapsed_ms,
+    )
+    out = io.BytesIO(processed)
+    out.name = name
+    return out
+
+
+# ─── HTTP client ────────────────────────────────────────────
+
+_http = None
+_http_lock = threading.Lock()
+
+
+def _get_http():
+    """
+    The process's pool manager, installed into the SDK on first use (after
+    the gunicorn fork, so workers never share sockets).
+
+    Retries cover connection failures and 420/429/503 answers, with
+    jittered exponential backoff (honouring Retry-After). A request that
+    may have reached Cloudinary — timed out after it was sent, or answered
+    500/502/504 — is not repeated: the upload may already be stored, and a
+    duplicate would have no Asset row and never be deleted.
+    """
+    global _http
+    with _http_lock:
+        if _http is None:
+            attempts = getattr(settings, "CLOUDINARY_RETRIES", 3)
+            retries = Retry(
+                total=attempts,
+                connect=attempts,
+                read=0,
+                status=attempts,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=None,       # POST too: uploads and deletes
+                backoff_factor=0.5,
+                backoff_jitter=0.5,
+                backoff_max=10,
+                raise_on_status=False,      # the SDK turns the last answer into an error
+            )
+            timeout = Timeout(
+                connect=getattr(settings, "CLOUDINARY_CONNECT_TIMEOUT", 5),
+                read=getattr(settings, "CLOUDINARY_READ_TIMEOUT", 60),
+            )
+            _http = get_http_connector(cloudinary.config(), {
+                **cloudinary.CERT_KWARGS,
+                "maxsize": getattr(settings, "CLOUDINARY_POOL_SIZE", 10),
+                "retries": retries,
+                "timeout": timeout,
+            })
+            # The SDK sends every request through these module-level managers
+            cloudinary.uploader._http = _http
+            cloudinary.api_client.call_api._http = _http
+        return _http
+
+
+# ─── Upload / delete ────────────────────────────────────────
+
 
 def upload_image(file, folder="befa", **kwargs):
     """
-    Upload an image to Cloudinary.
-    Returns dict with 'secure_url' and 'public_id'.
+    Upload an image to Cloudinary (pre-processed first if enabled).
+    Returns dict with 'secure_url' and 'public_id'. Pass timeout= (seconds
+    or a urllib3 Timeout) to override the configured one for this call.
     """
+    file = preprocess_image(file)
+    _get_http()
     try:
         result = cloudinary.uploader.upload(
             file,
@@ -30,12 +210,47 @@ def upload_image(file, folder="befa", **kwargs):
         raise
 
 
+def upload_images(files, folder="befa", max_workers=None, **kwargs):
+    """
+    Upload several files concurrently, at most CLOUDINARY_BATCH_WORKERS at
+    a time. Returns one entry per file, in order: the upload_image() result
+    or the exception it raised.
+    """
+    files = list(files)
+    if not files:
+        return []
+    _get_http()
+    workers = min(len(files), max_workers or getattr(settings, "CLOUDINARY_BATCH_WORKERS", 4))
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cloudinary") as pool:
+        futures = [pool.submit(upload_image, file, folder, **kwargs) for file in files]
+    results = [future.exception() or future.result() for future in futures]
+    logger.info(
+        "Uploaded %d/%d files to %s in %.0f ms (%d workers)",
+        sum(not isinstance(result, Exception) for result in results),
+        len(files), folder, (time.perf_counter() - started) * 1000, workers,
+    )
+    return results
+
+
 def delete_image(public_id):
     """Delete an image from Cloudinary by public_id."""
     if not public_id:
         return
+    _get_http()
     try:
         cloudinary.uploader.destroy(public_id)
         logger.info("Deleted Cloudinary image: %s", public_id)
     except Exception as e:
         logger.warning("Cloudinary delete failed for %s: %s", public_id, e)
+
+
+def delete_images(public_ids):
+    """
+    Bulk-delete up to 100 images in one Admin API call.
+    Returns {public_id: status} ("deleted", "not_found", ...); raises on
+    API errors so the caller can retry.
+    """
+    _get_http()
+    result = cloudinary.api.delete_resources(list(public_ids))
+    return result.get("deleted", {})
@@ -0,0 +1,109 @@
+"""
+HTTP conditional GET (ETag → 304) for model-backed views.
+
+The validator is a cheap watermark of the queryset the view would serve —
+max(updated_at) plus row count — cached under the view's cache tags, so a
+repeat request is answered with 304 before the serializer (or even the
+cached body) is touched.
+
+There is deliberately no Last-Modified: max(updated_at) does not move when
+a row is deleted or when related data (likes) changes, so If-Modified-Since
+would answer 304 for a changed response. The ETag also covers the row count
+and the tag versions.
+"""
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+
+from utils.cache import CACHE_TTL, cache_key, versioned_key
+
+
+class NotModified(Exception):
+    """Raised from initial() to short-circuit the handler with a 304."""
+
+
+class ConditionalGetMixin:
+    """
+    Add to a generic (list or detail) view. Permissions and throttling still
+    run first; the watermark query runs at most once per watermark_timeout
+    per URL and tag version.
+    """
+    watermark_field = "updated_at"
+    watermark_tags = ()
+    watermark_timeout = CACHE_TTL["short"]
+    watermark_per_viewer = False        # response differs per user (e.g. is_liked)
+    cache_control = "public, max-age=0, must-revalidate"
+
+    def get_watermark_queryset(self):
+        queryset = self.get_queryset()
+        if hasattr(self, "filter_queryset"):
+            queryset = self.filter_queryset(queryset)
+        lookup_url_kwarg = getattr(self, "lookup_url_kwarg", None) or getattr(self, "lookup_field", None)
+        if lookup_url_kwarg and lookup_url_kwarg in self.kwargs:
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return queryset
+
+    def get_watermark(self):
+        """(cache key, last_modified or None, row count), cached per URL."""
+        path = hashlib.blake2b(self.request.get_full_path().encode(), digest_size=16).hexdigest()
+        key = versioned_key(cache_key("watermark", type(self).__name__, path), self.watermark_tags)
+        watermark = cache.get(key)
+        if watermark is None:
+            result = self.get_watermark_queryset().aggregate(
+                last=Max(self.watermark_field), count=Count("pk")
+            )
+            watermark = (result["last"], result["count"])
+            cache.set(key, watermark, timeout=self.watermark_timeout)
+        return (key, *watermark)
+
+    def get_etag(self):
+        # The key embeds the tag versions, so any tagged write changes the ETag
+        key, last_modified, count = self.get_watermark()
+        parts = [key, last_modified.isoformat() if last_modified else "", str(count)]
+        if self.watermark_per_viewer and self.request.user.is_authenticated:
+            parts.append(str(self.request.user.pk))
+        return '"%s"' % hashlib.blake2b("|".join(parts).encode(), digest_size=16).hexdigest()
+
+    def _not_modified(self, etag):
+        if_none_match = self.request.headers.get("If-None-Match")
+        return bool(if_none_match) and (
+            if_none_match.strip() == "*"
+            or etag in [tag.removeprefix("W/") for tag in parse_etags(if_none_match)]
+        )
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._etag = None
+        if request.method in ("GET", "HEAD"):
+            self._etag = self.get_etag()
+            if self._not_modified(self._etag):
+                raise NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return HttpResponseNotModified()
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        etag = getattr(self, "_etag", None)
+        if etag and response.status_code in (200, 304):
+            # A stale body from cached_view predates the watermark: handing
+            # out the current ETag would let the client revalidate it forever.
+            # (A pre-rendered body keeps its own content ETag.)
+            if not getattr(response, "cache_stale", False):
+                response["ETag"] = etag
+            per_viewer = self.watermark_per_viewer and request.user.is_authenticated
+            response["Cache-Control"] = "private, no-cache" if per_viewer else self.cache_control
+            if self.watermark_per_viewer:
+                patch_vary_headers(response, ["Authorization"])
+        return response
+
+
+class AdminConditionalGetMixin(ConditionalGetMixin):
+    """Admin portal variant: never stored by shared caches."""
+    cache_control = "private, no-cache"
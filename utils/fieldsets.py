@@ -0,0 +1,107 @@
+"""
+Sparse fieldsets: ?fields=id,title keeps only those fields in the
+response, ?omit=bio,notes drops fields. Read requests only.
+
+SparseFieldsetMixin (serializers) trims the top-level fields;
+SparseFieldsetViewMixin (generic views) passes the selection to the
+serializer and narrows the queryset with .only() to the columns the
+remaining fields read, so wide TextFields nobody asked for are never
+fetched.
+
+A field that does not map onto a model column (a SerializerMethodField,
+a property) stops the narrowing unless the serializer lists the columns
+it needs in Meta.field_columns, e.g. {"like_count": ()}.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.serializers import ListSerializer
+
+FIELDS_PARAM = "fields"
+OMIT_PARAM = "omit"
+
+
+def _names(value):
+    return {name.strip() for name in (value or "").split(",") if name.strip()}
+
+
+def parse_fieldset(request):
+    """(fields to keep or None, fields to drop) from the query string."""
+    if request is None or request.method not in SAFE_METHODS:
+        return None, set()
+    params = request.query_params
+    return _names(params.get(FIELDS_PARAM)) or None, _names(params.get(OMIT_PARAM))
+
+
+class SparseFieldsetMixin:
+    """Serializer mixin honouring ?fields= / ?omit= on the outermost serializer."""
+
+    def get_fields(self):
+        fields = super().get_fields()
+        parent = self.parent
+        if parent is not None and not (isinstance(parent, ListSerializer) and parent.parent is None):
+            return fields   # nested serializers keep their full shape
+
+        if "sparse_fieldset" in self.context:
+            wanted, omitted = self.context["sparse_fieldset"]
+        else:
+            wanted, omitted = parse_fieldset(self.context.get("request"))
+        for name in list(fields):
+            if (wanted is not None and name not in wanted) or name in omitted:
+                del fields[name]
+        return fields
+
+
+def required_columns(serializer, model):
+    """
+    Model fields the serializer's readable fields load, for .only(); None
+    when one of them cannot be mapped (then nothing is deferred).
+    """
+    if isinstance(serializer, ListSerializer):
+        serializer = serializer.child
+    declared = getattr(getattr(serializer, "Meta", None), "field_columns", {})
+    columns = {model._meta.pk.name}
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if name in declared:
+            columns.update(declared[name])
+            continue
+        if field.source == "*":
+            return None
+        try:
+            model_field = model._meta.get_field(field.source.split(".")[0])
+        except FieldDoesNotExist:
+            return None
+        if model_field.concrete and not model_field.many_to_many:
+            columns.add(model_field.name)
+        # Reverse and many-to-many relations are fetched by pk; no column needed
+    return columns
+
+
+class SparseFieldsetViewMixin:
+    """
+    Generic view mixin: sends the ?fields= / ?omit= selection to the
+    serializer and projects the queryset onto the columns it needs.
+    """
+    sparse_fieldsets = True
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.sparse_fieldsets:
+            context["sparse_fieldset"] = parse_fieldset(self.request)
+        return context
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if not self.sparse_fieldsets or self.request.method not in SAFE_METHODS:
+            return queryset
+        columns = required_columns(self.get_serializer(), queryset.model)
+        if columns is None:
+            return queryset
+        # select_related() relations must stay loaded or .only() refuses them
+        select_related = queryset.query.select_related
+        if select_related is True:
+            return queryset
+        if select_related:
+            columns.update(select_related)
+        return queryset.only(*columns)
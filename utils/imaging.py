@@ -0,0 +1,46 @@
+"""
+Image pre-processing run in utils.cloudinary_service's process pool.
+
+Kept free of Django and cloudinary imports: pool processes are started
+fresh (forkserver) and import only this module and Pillow.
+"""
+import io
+
+ALLOWED_FORMATS = {"JPEG", "PNG", "WEBP", "GIF", "BMP", "TIFF", "MPO"}
+MAX_PIXELS = 60_000_000         # decompression-bomb guard
+
+
+def preprocess(data, max_dimension, quality):
+    """
+    Bytes in, (webp bytes or None, reason) out.
+    None means "upload the original" (animated images).
+    """
+    from PIL import Image, ImageOps
+
+    Image.MAX_IMAGE_PIXELS = MAX_PIXELS
+    too_large = f"Image is larger than {MAX_PIXELS // 1_000_000} megapixels"
+    try:
+        with Image.open(io.BytesIO(data)) as probe:
+            image_format, pixels = probe.format, probe.width * probe.height
+            probe.verify()
+    except Image.DecompressionBombError:
+        raise ValueError(too_large)
+    except Exception:
+        raise ValueError("Not a valid image")
+    # Pillow only warns between 1x and 2x MAX_IMAGE_PIXELS
+    if pixels > MAX_PIXELS:
+        raise ValueError(too_large)
+    if image_format not in ALLOWED_FORMATS:
+        raise ValueError(f"Unsupported image format {image_format}")
+
+    with Image.open(io.BytesIO(data)) as image:
+        if getattr(image, "is_animated", False):
+            return None, "animated"
+        # Apply the EXIF orientation, then re-encode without any metadata
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB")
+        image.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+        out = io.BytesIO()
+        image.save(out, format="WEBP", quality=quality, method=4)
+        return out.getvalue(), f"{image.width}x{image.height}"
@@ -0,0 +1,18 @@
+"""
+Project middleware.
+"""
+from utils.cache import coalesced_invalidations
+
+
+class CoalesceInvalidationsMiddleware:
+    """
+    Batch every cache invalidation a request triggers (views, signals) and
+    send them once, de-duplicated, after the request's writes are committed.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with coalesced_invalidations():
+            return self.get_response(request)
@@ -0,0 +1,120 @@
+"""
+Pagination classes.
+"""
+import base64
+import json
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class OptionalPageNumberPagination(PageNumberPagination):
+    """
+    Page-number pagination that only kicks in when ?page= is given.
+    Public lists keep returning a plain array to existing clients, while
+    new clients can page through them (and each page is cached on its own).
+    """
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.page_query_param not in request.query_params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Keyset (cursor) pagination ordered by (-created_at, id).
+    Each page is an index range scan starting from the edge row of the
+    previous page — no COUNT(*) and no OFFSET — so a deep page costs the same
+    as the first. Cursors encode that row's (created_at, id), so they stay
+    valid when rows are inserted, and filters/search apply as usual.
+    """
+    ordering_field = "created_at"
+    cursor_query_param = "cursor"
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+        field = self.ordering_field
+
+        if cursor is None or not cursor["r"]:
+            queryset = queryset.order_by(f"-{field}", "id")
+            if cursor is not None:
+                # The redundant __lte bound gives the index scan a start point;
+                # the OR alone would be filtered row by row from the top
+                queryset = queryset.filter(
+                    Q(**{f"{field}__lt": cursor["c"]}) | Q(**{field: cursor["c"], "id__gt": cursor["i"]}),
+                    **{f"{field}__lte": cursor["c"]},
+                )
+            rows = list(queryset[: page_size + 1])
+            self.has_next = len(rows) > page_size
+            self.has_previous = cursor is not None
+            self.page = rows[:page_size]
+        else:
+            # Walking backwards: scan the other way, then restore page order
+            queryset = queryset.order_by(field, "-id").filter(
+                Q(**{f"{field}__gt": cursor["c"]}) | Q(**{field: cursor["c"], "id__lt": cursor["i"]}),
+                **{f"{field}__gte": cursor["c"]},
+            )
+            rows = list(queryset[: page_size + 1])
+            self.has_previous = len(rows) > page_size
+            self.has_next = True
+            self.page = rows[:page_size][::-1]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param], strict=True, cutoff=self.max_page_size
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            cursor["c"] = datetime.fromisoformat(cursor["c"])
+            cursor["i"] = int(cursor["i"])
+            cursor["r"] = bool(cursor.get("r"))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def encode_cursor(self, row, reverse):
+        cursor = {"c": getattr(row, self.ordering_field).isoformat(), "i": row.pk}
+        if reverse:
+            cursor["r"] = 1
+        encoded = base64.urlsafe_b64encode(json.dumps(cursor).encode()).decode()
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })